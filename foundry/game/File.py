@@ -1,7 +1,7 @@
 from os.path import basename
 from typing import List, Optional
 
-from smb3parse.constants import BASE_OFFSET, PAGE_A000_ByTileset
+from smb3parse.constants import PAGE_A000_ByTileset
 from smb3parse.util.rom import Rom
 
 WORLD_COUNT = 9  # includes warp zone
@@ -15,6 +15,8 @@ TSA_OS_LIST = PAGE_A000_ByTileset
 TSA_TABLE_SIZE = 0x400
 TSA_TABLE_INTERVAL = TSA_TABLE_SIZE + 0x1C00
 
+CHR_ROM_OFFSET = 0x40010
+
 
 class ROM(Rom):
     MARKER_VALUE = bytes("SMB3FOUNDRY", "ascii")
@@ -28,6 +30,12 @@ class ROM(Rom):
 
     W_INIT_OS_LIST: List[int] = []
 
+    generation = 0
+    """Changes every time the ROM was written to, or a new ROM was loaded."""
+
+    chr_generation = 0
+    """Changes every time the CHR data of the ROM was written to, or a new ROM was loaded."""
+
     def __init__(self, path: Optional[str] = None):
         if not ROM.rom_data:
             if path is None:
@@ -39,20 +47,6 @@ class ROM(Rom):
 
         self.position = 0
 
-    @staticmethod
-    def get_tsa_data(object_set: int) -> bytearray:
-        rom = ROM()
-
-        tsa_index = rom.int(TSA_OS_LIST + object_set)
-
-        if object_set == 0:
-            # todo why is the tsa index in the wrong (seemingly) false?
-            tsa_index += 1
-
-        tsa_start = BASE_OFFSET + tsa_index * TSA_TABLE_INTERVAL
-
-        return rom.read(tsa_start, TSA_TABLE_SIZE)
-
     @staticmethod
     def load_from_file(path: str):
         with open(path, "rb") as rom:
@@ -61,6 +55,9 @@ class ROM(Rom):
         ROM.path = path
         ROM.name = basename(path)
 
+        ROM.generation += 1
+        ROM.chr_generation += 1
+
         additional_data_start = data.find(ROM.MARKER_VALUE)
 
         if additional_data_start == -1:
@@ -146,3 +143,17 @@ class ROM(Rom):
         self.position += len(data)
 
         ROM.rom_data[position : position + len(data)] = data
+
+        ROM._on_write(position, len(data))
+
+    def write(self, offset: int, data: bytes):
+        super(ROM, self).write(offset, data)
+
+        ROM._on_write(offset, len(data))
+
+    @staticmethod
+    def _on_write(position: int, length: int):
+        ROM.generation += 1
+
+        if position + length > CHR_ROM_OFFSET:
+            ROM.chr_generation += 1
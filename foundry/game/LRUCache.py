@@ -0,0 +1,116 @@
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, NamedTuple, Optional
+
+from PySide2.QtGui import QImage, QPixmap
+
+
+class CacheStats(NamedTuple):
+    name: str
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_in_bytes: int
+    max_bytes: int
+
+
+def image_size(image: QImage) -> int:
+    return image.sizeInBytes()
+
+
+def pixmap_size(pixmap: QPixmap) -> int:
+    return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+
+class LRUCache:
+    """
+    A cache, that holds values up to a combined size in bytes. When that size is exceeded, the values, that were not
+    used for the longest time, are removed.
+
+    All caches are kept track of in LRUCache.instances, so their statistics can be shown together.
+    """
+
+    instances: List["LRUCache"] = []
+
+    def __init__(self, name: str, max_bytes: int, size_of: Callable[[Any], int] = image_size):
+        """
+        :param name: Used to tell the caches apart in their statistics.
+        :param max_bytes: The combined size, that the values in the cache must not exceed.
+        :param size_of: Returns the size of a value in bytes. Works on QImages by default.
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes = {}
+
+        self.size_in_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        LRUCache.instances.append(self)
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Optional[Any]:
+        if key not in self._entries:
+            self.misses += 1
+
+            return default
+
+        self.hits += 1
+
+        self._entries.move_to_end(key)
+
+        return self._entries[key]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = value
+        self._sizes[key] = self.size_of(value)
+
+        self.size_in_bytes += self._sizes[key]
+
+        self._evict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __delitem__(self, key: Hashable):
+        self._remove(key)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_max_bytes(self, max_bytes: int):
+        self.max_bytes = max_bytes
+
+        self._evict()
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+
+        self.size_in_bytes = 0
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            self.name, self.hits, self.misses, self.evictions, len(self), self.size_in_bytes, self.max_bytes
+        )
+
+    def _remove(self, key: Hashable):
+        del self._entries[key]
+
+        self.size_in_bytes -= self._sizes.pop(key)
+
+    def _evict(self):
+        # always keep the newest value, even if it is bigger than the whole cache
+        while self.size_in_bytes > self.max_bytes and len(self._entries) > 1:
+            oldest_key = next(iter(self._entries))
+
+            self._remove(oldest_key)
+
+            self.evictions += 1
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List
+from typing import List, Set, Tuple
 
 from foundry import data_dir
 from smb3parse.objects.object_set import (
@@ -61,6 +61,103 @@ class EndType(Enum):
     TWO_ENDS = 3
 
 
+class OverlayType(Enum):
+    """
+    Some level objects get an image drawn on top of them in the editor, showing what they do in the game, like the
+    item in a block or whether a pipe can be entered. This enum lists the kinds of those overlays.
+    """
+
+    NONE = 0
+    PIPE_UP = 1
+    PIPE_DOWN = 2
+    PIPE_LEFT = 3
+    PIPE_RIGHT = 4
+    DOOR = 5
+    INVISIBLE_DOOR = 6
+    NOTE_BLOCK_JUMP = 7
+    ITEM_BLOCK = 8
+    INVISIBLE_ITEM = 9
+    SILVER_COINS = 10
+
+
+class OverlayItem(Enum):
+    """
+    The item shown in the overlay of blocks and invisible items.
+    """
+
+    NONE = 0
+    FIRE_FLOWER = 1
+    LEAF = 2
+    CONTINUOUS_STAR = 3
+    STAR = 4
+    MULTI_COIN = 5
+    COIN = 6
+    ONE_UP = 7
+    VINE = 8
+    P_SWITCH = 9
+
+
+def overlay_of(description: str) -> Tuple[OverlayType, OverlayItem]:
+    """
+    Classifies the overlay of an object by its description.
+    """
+    name = description.lower()
+
+    if "pipe" in name and "can go" in name:
+        if "left" in name:
+            return OverlayType.PIPE_LEFT, OverlayItem.NONE
+        elif "right" in name:
+            return OverlayType.PIPE_RIGHT, OverlayItem.NONE
+        elif "down" in name:
+            return OverlayType.PIPE_DOWN, OverlayItem.NONE
+        else:
+            return OverlayType.PIPE_UP, OverlayItem.NONE
+
+    elif "invisible door" in name:
+        return OverlayType.INVISIBLE_DOOR, OverlayItem.NONE
+
+    elif "door" == name or "door (can go" in name:
+        return OverlayType.DOOR, OverlayItem.NONE
+
+    elif "red invisible note" in name:
+        return OverlayType.NOTE_BLOCK_JUMP, OverlayItem.NONE
+
+    elif "'?' with" in name or "brick with" in name or "bricks with" in name or "block with" in name:
+        return OverlayType.ITEM_BLOCK, _overlay_item_of(name)
+
+    elif "invisible" in name:
+        return OverlayType.INVISIBLE_ITEM, _overlay_item_of(name)
+
+    elif "silver coins" in name:
+        return OverlayType.SILVER_COINS, OverlayItem.NONE
+
+    else:
+        return OverlayType.NONE, OverlayItem.NONE
+
+
+def _overlay_item_of(name: str) -> OverlayItem:
+    if "flower" in name:
+        return OverlayItem.FIRE_FLOWER
+    elif "leaf" in name:
+        return OverlayItem.LEAF
+    elif "continuous star" in name:
+        return OverlayItem.CONTINUOUS_STAR
+    elif "star" in name:
+        return OverlayItem.STAR
+    elif "multi-coin" in name:
+        return OverlayItem.MULTI_COIN
+    elif "coin" in name:
+        return OverlayItem.COIN
+    elif "1-up" in name:
+        return OverlayItem.ONE_UP
+    elif "vine" in name:
+        return OverlayItem.VINE
+    elif "p-switch" in name:
+        return OverlayItem.P_SWITCH
+    else:
+        return OverlayItem.NONE
+
+
 ENEMY_OBJECT_DEFINITION = 12
 
 
@@ -99,6 +196,8 @@ class ObjectDefinition:
 
         self.description = self.description.split("|")[0]
 
+        self.overlay, self.overlay_item = overlay_of(self.description)
+
     def __repr__(self):
         return f"ObjectDefinition: {self.description}"
 
@@ -159,12 +258,16 @@ object_set_to_definition = {
 }
 
 
+# the rom object designs are read into the shared object definitions once, every object set refers to them after that
+_loaded_object_definitions: Set[int] = set()
+
+
 def load_object_definitions(object_set):
     global object_metadata
 
     object_definition = object_set_to_definition[object_set]
 
-    if object_definition == ENEMY_OBJECT_DEFINITION:
+    if object_definition == ENEMY_OBJECT_DEFINITION or object_definition in _loaded_object_definitions:
         return object_metadata[object_definition]
 
     with open(data_dir.joinpath(f"romobjs{object_definition}.dat"), "rb") as obj_def:
@@ -200,6 +303,8 @@ def load_object_definitions(object_set):
 
             position += 1
 
+    _loaded_object_definitions.add(object_definition)
+
     # read overlay data
     if position >= len(data):
         return
@@ -0,0 +1,68 @@
+"""
+Data derived from the ROM, like TSA tables and palettes, is needed on every paint, but only changes, when the ROM does.
+Functions decorated with rom_cached only read from the ROM once per set of arguments, until the ROM is written to or a
+new one is loaded.
+
+Cached values are shared, so they must not be modified.
+"""
+
+from functools import wraps
+from typing import Callable, Dict, List
+
+from foundry.game.File import ROM, TSA_OS_LIST, TSA_TABLE_INTERVAL, TSA_TABLE_SIZE
+from smb3parse.constants import BASE_OFFSET
+
+_caches: List[Dict] = []
+_cache_generation = -1
+
+
+def rom_cached(func: Callable) -> Callable:
+    cache: Dict = {}
+
+    _caches.append(cache)
+
+    @wraps(func)
+    def wrapper(*args):
+        _check_generation()
+
+        if args not in cache:
+            cache[args] = func(*args)
+
+        return cache[args]
+
+    return wrapper
+
+
+def clear_rom_cache():
+    for cache in _caches:
+        cache.clear()
+
+
+def _check_generation():
+    global _cache_generation
+
+    if _cache_generation != ROM.generation:
+        clear_rom_cache()
+
+        _cache_generation = ROM.generation
+
+
+@rom_cached
+def tsa_index_of(object_set: int) -> int:
+    """
+    The bank of the TSA data of the given object set, as found in PAGE_A000_ByTileset.
+    """
+    tsa_index = ROM().int(TSA_OS_LIST + object_set)
+
+    if object_set == 0:
+        # todo why is the tsa index in the wrong (seemingly) false?
+        tsa_index += 1
+
+    return tsa_index
+
+
+@rom_cached
+def tsa_data_of(object_set: int) -> bytes:
+    tsa_start = BASE_OFFSET + tsa_index_of(object_set) * TSA_TABLE_INTERVAL
+
+    return bytes(ROM().read(tsa_start, TSA_TABLE_SIZE))
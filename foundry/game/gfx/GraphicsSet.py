@@ -1,7 +1,8 @@
-from foundry.game.File import ROM
+from typing import Dict
+
+from foundry.game.File import CHR_ROM_OFFSET, ROM
 from smb3parse.constants import Level_BG_Pages1, Level_BG_Pages2
 
-CHR_ROM_OFFSET = 0x40010
 CHR_ROM_SEGMENT_SIZE = 0x400
 
 WORLD_MAP = 0
@@ -9,6 +10,11 @@ SPADE_ROULETTE = 16
 N_SPADE = 17
 VS_2P = 18
 
+CHR_TILE_SIZE = 0x10  # bytes, 2 bit planes of 8 bytes each
+CHR_TILE_SIDE_LENGTH = 8  # pixel
+CHR_TILE_PIXEL_COUNT = CHR_TILE_SIDE_LENGTH * CHR_TILE_SIDE_LENGTH
+CHR_PLANE_OFFSET = 8  # both bits describing the color of a pixel are in separate 8 byte chunks at the same index
+
 BG_PAGE_COUNT = Level_BG_Pages2 - Level_BG_Pages1  # 23 in stock rom
 
 GRAPHIC_SET_NAMES = [
@@ -47,18 +53,68 @@ GRAPHIC_SET_NAMES = [
 ]
 
 
+def _spread_bits(byte: int) -> int:
+    """
+    Moves every bit of the given byte into a byte of its own, keeping their order.
+
+    For example 0b1010_0000 becomes 0x0100_0100_0000_0000.
+    """
+    spread = 0
+
+    for bit in range(8):
+        if byte & (1 << bit):
+            spread |= 1 << (8 * bit)
+
+    return spread
+
+
+_SPREAD_BITS = [_spread_bits(byte) for byte in range(0x100)]
+
+
+def decode_chr_data(chr_data: bytes) -> bytes:
+    """
+    Decodes the 2bpp planar CHR data of the NES into one byte per pixel, holding the color index (0-3) of that pixel.
+
+    :param chr_data: The raw CHR data. Trailing bytes, that do not make up a complete tile, are ignored.
+
+    :return: The color indexes of every tile in order. Each tile takes up 8 consecutive rows of 8 pixels.
+    """
+    decoded = bytearray()
+
+    for tile_start in range(0, len(chr_data) - CHR_TILE_SIZE + 1, CHR_TILE_SIZE):
+        for row in range(CHR_TILE_SIDE_LENGTH):
+            low_bits = _SPREAD_BITS[chr_data[tile_start + row]]
+            high_bits = _SPREAD_BITS[chr_data[tile_start + CHR_PLANE_OFFSET + row]]
+
+            decoded.extend((low_bits | (high_bits << 1)).to_bytes(CHR_TILE_SIDE_LENGTH, "big"))
+
+    return bytes(decoded)
+
+
 class GraphicsSet:
+    """
+    The CHR data making up the tiles of a graphics set. Its data is not supposed to be changed, so instances can be
+    shared. Use GraphicsSet.from_number() to get the shared instance for a graphics set, instead of reading it from the
+    ROM again.
+    """
+
     GRAPHIC_SET_BG_PAGE_1 = []
     GRAPHIC_SET_BG_PAGE_2 = []
 
+    _registry: Dict[int, "GraphicsSet"] = {}
+    _registry_generation = -1
+
     def __init__(self, graphic_set_number):
-        if not self.GRAPHIC_SET_BG_PAGE_1:
-            self.GRAPHIC_SET_BG_PAGE_1 = ROM().bulk_read(BG_PAGE_COUNT, Level_BG_Pages1)
-            self.GRAPHIC_SET_BG_PAGE_2 = ROM().bulk_read(BG_PAGE_COUNT, Level_BG_Pages2)
+        if not GraphicsSet.GRAPHIC_SET_BG_PAGE_1:
+            GraphicsSet.GRAPHIC_SET_BG_PAGE_1 = ROM().bulk_read(BG_PAGE_COUNT, Level_BG_Pages1)
+            GraphicsSet.GRAPHIC_SET_BG_PAGE_2 = ROM().bulk_read(BG_PAGE_COUNT, Level_BG_Pages2)
 
-        self.data = bytearray()
+        self._chr_data = bytearray()
         self.number = graphic_set_number
 
+        self._tile_data = bytes()
+        self._mirrored_tile_data = bytes()
+
         segments = []
 
         if graphic_set_number == WORLD_MAP:
@@ -83,6 +139,68 @@ class GraphicsSet:
 
         self._read_in(segments)
 
+        self.data = bytes(self._chr_data)
+        del self._chr_data
+
+    @staticmethod
+    def from_number(graphic_set_number: int) -> "GraphicsSet":
+        """
+        Returns the shared GraphicsSet for the given number. It is only read from the ROM again, after the CHR data of
+        the ROM was written to.
+        """
+        if GraphicsSet._registry_generation != ROM.chr_generation:
+            GraphicsSet._registry.clear()
+            GraphicsSet._registry_generation = ROM.chr_generation
+
+            # a new ROM might have been loaded, so read the background pages again as well
+            GraphicsSet.GRAPHIC_SET_BG_PAGE_1 = []
+            GraphicsSet.GRAPHIC_SET_BG_PAGE_2 = []
+
+        if graphic_set_number not in GraphicsSet._registry:
+            GraphicsSet._registry[graphic_set_number] = GraphicsSet(graphic_set_number)
+
+        return GraphicsSet._registry[graphic_set_number]
+
+    @property
+    def tile_count(self) -> int:
+        return len(self.data) // CHR_TILE_SIZE
+
+    @property
+    def tile_data(self) -> bytes:
+        """
+        The color indexes of all tiles in this graphics set, decoded once on first access. The pixels of tile n are at
+        [n * 64, (n + 1) * 64), row by row.
+        """
+        if not self._tile_data:
+            self._tile_data = decode_chr_data(self.data)
+
+        return self._tile_data
+
+    @property
+    def mirrored_tile_data(self) -> bytes:
+        """
+        The same as tile_data, but with every tile mirrored horizontally. Derived from tile_data on first access.
+        """
+        if not self._mirrored_tile_data:
+            tile_data = self.tile_data
+
+            self._mirrored_tile_data = b"".join(
+                tile_data[row_start : row_start + CHR_TILE_SIDE_LENGTH][::-1]
+                for row_start in range(0, len(tile_data), CHR_TILE_SIDE_LENGTH)
+            )
+
+        return self._mirrored_tile_data
+
+    def tile_pixels(self, tile_index: int, mirrored=False) -> bytes:
+        start = tile_index * CHR_TILE_PIXEL_COUNT
+
+        if mirrored:
+            tile_data = self.mirrored_tile_data
+        else:
+            tile_data = self.tile_data
+
+        return tile_data[start : start + CHR_TILE_PIXEL_COUNT]
+
     def _read_in(self, segments):
         for segment in segments:
             self._read_in_chr_rom_segment(segment)
@@ -91,4 +209,4 @@ class GraphicsSet:
         offset = CHR_ROM_OFFSET + index * CHR_ROM_SEGMENT_SIZE
         chr_rom_data = ROM().bulk_read(2 * CHR_ROM_SEGMENT_SIZE, offset)
 
-        self.data.extend(chr_rom_data)
+        self._chr_data.extend(chr_rom_data)
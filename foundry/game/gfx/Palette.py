@@ -4,6 +4,7 @@ from PySide2.QtGui import QColor
 
 from foundry import root_dir
 from foundry.game.File import ROM
+from foundry.game.RomCache import rom_cached
 from smb3parse.constants import PalSet_Maps, Palette_By_Tileset
 from smb3parse.levels import BASE_OFFSET
 
@@ -29,7 +30,7 @@ PALETTE_DATA_SIZE = (
     * COLORS_PER_PALETTE
 )
 
-PaletteGroup = List[bytearray]
+PaletteGroup = List[bytes]
 
 palette_file = root_dir.joinpath("data", "Default.pal")
 
@@ -48,9 +49,10 @@ for i in range(COLOR_COUNT):
     offset += BYTES_IN_COLOR
 
 
+@rom_cached
 def load_palette_group(object_set: int, palette_group_index: int) -> PaletteGroup:
     """
-    Basically does, what the Setup_PalData routine does.
+    Basically does, what the Setup_PalData routine does. The returned palette group is shared and must not be changed.
 
     :param object_set: Level_Tileset in the disassembly.
     :param palette_group_index: Palette_By_Tileset. Defined in the level header.
@@ -68,13 +70,14 @@ def load_palette_group(object_set: int, palette_group_index: int) -> PaletteGrou
     palettes = []
 
     for _ in range(PALETTES_PER_PALETTES_GROUP):
-        palettes.append(rom.read(palette_address, COLORS_PER_PALETTE))
+        palettes.append(bytes(rom.read(palette_address, COLORS_PER_PALETTE)))
 
         palette_address += COLORS_PER_PALETTE
 
     return palettes
 
 
+@rom_cached
 def bg_color_for_object_set(object_set_number: int, palette_group_index: int) -> QColor:
     palette_group = load_palette_group(object_set_number, palette_group_index)
 
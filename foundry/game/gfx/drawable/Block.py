@@ -1,27 +1,28 @@
-from PySide2.QtCore import QPoint
-from PySide2.QtGui import QColor, QImage, QPainter, Qt
+from typing import List
+
+from PySide2.QtGui import QColor, QImage, qRgba
 
 from foundry.game.File import ROM
+from foundry.game.RomCache import rom_cached
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import NESPalette, PaletteGroup
-from foundry.game.gfx.drawable import MASK_COLOR, apply_selection_overlay
+from foundry.game.gfx.drawable import blend_with_selection_overlay
 from foundry.game.gfx.drawable.Tile import Tile
-from smb3parse.objects.object_set import CLOUDY_GRAPHICS_SET
 
 TSA_BANK_0 = 0 * 256
 TSA_BANK_1 = 1 * 256
 TSA_BANK_2 = 2 * 256
 TSA_BANK_3 = 3 * 256
 
+TRANSPARENT = qRgba(0, 0, 0, 0)
+
 
-def get_block(block_index, palette_group, graphics_set, tsa_data):
+@rom_cached
+def resolve_block_index(block_index: int) -> int:
     if block_index > 0xFF:
-        rom_block_index = ROM().get_byte(block_index)  # block_index is an offset into the graphic memory
-        block = Block(rom_block_index, palette_group, graphics_set, tsa_data)
+        return ROM().get_byte(block_index)  # block_index is an offset into the graphic memory
     else:
-        block = Block(block_index, palette_group, graphics_set, tsa_data)
-
-    return block
+        return block_index
 
 
 class Block:
@@ -33,8 +34,6 @@ class Block:
 
     tsa_data = bytes()
 
-    _block_cache = {}
-
     def __init__(
         self,
         block_index: int,
@@ -47,14 +46,6 @@ class Block:
 
         palette_index = (block_index & 0b1100_0000) >> 6
 
-        if graphics_set.number == CLOUDY_GRAPHICS_SET:
-            self.bg_color = QColor(*NESPalette[palette_group[palette_index][2]])
-        else:
-            self.bg_color = QColor(*NESPalette[palette_group[palette_index][0]])
-
-        # can't hash list, so turn it into a string instead
-        self._block_id = (block_index, str(palette_group), graphics_set.number)
-
         lu = tsa_data[TSA_BANK_0 + block_index]
         ld = tsa_data[TSA_BANK_1 + block_index]
         ru = tsa_data[TSA_BANK_2 + block_index]
@@ -70,59 +61,59 @@ class Block:
             self.ru_tile = Tile(ru, palette_group, palette_index, graphics_set)
             self.rd_tile = Tile(rd, palette_group, palette_index, graphics_set)
 
-        self.image = QImage(Block.WIDTH, Block.HEIGHT, QImage.Format_RGB888)
-        painter = QPainter(self.image)
+        self.background_color_index = self.lu_tile.background_color_index
 
-        painter.drawImage(QPoint(0, 0), self.lu_tile.as_image())
-        painter.drawImage(QPoint(Tile.WIDTH, 0), self.ru_tile.as_image())
-        painter.drawImage(QPoint(0, Tile.HEIGHT), self.ld_tile.as_image())
-        painter.drawImage(QPoint(Tile.WIDTH, Tile.HEIGHT), self.rd_tile.as_image())
+        # one byte per pixel, holding the color index into the palette of the block
+        self.pixels = _join_tiles(self.lu_tile, self.ru_tile, self.ld_tile, self.rd_tile)
 
-        painter.end()
+        self.colors = colors_of(palette_group[palette_index])
+        self.bg_color = QColor(self.colors[self.background_color_index])
 
-        if _image_only_one_color(self.image) and self.image.pixelColor(0, 0) == QColor(*MASK_COLOR):
-            self._whole_block_is_transparent = True
-        else:
-            self._whole_block_is_transparent = False
+        self._whole_block_is_transparent = self.pixels.count(self.background_color_index) == Block.PIXEL_COUNT
 
-    def draw(self, painter: QPainter, x, y, block_length, selected=False, transparent=False):
-        block_attributes = (self._block_id, block_length, selected, transparent)
+    def as_image(self, selected=False, transparent=False) -> QImage:
+        image = QImage(self.pixels, Block.WIDTH, Block.HEIGHT, Block.WIDTH, QImage.Format_Indexed8)
+        image.setColorTable(self.color_table(selected, transparent))
 
-        if block_attributes not in Block._block_cache:
-            image = self.image.copy()
+        # converting copies the pixels, so the image does not depend on self.pixels anymore
+        return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
 
-            if block_length != Block.WIDTH:
-                image = image.scaled(block_length, block_length)
+    def color_table(self, selected=False, transparent=False) -> List[int]:
+        return color_table_of(self.colors, self.background_color_index, selected, transparent)
 
-            # mask out the transparent pixels first
-            mask = image.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
-            image.setAlphaChannel(mask)
 
-            if not transparent:  # or self._whole_block_is_transparent:
-                image = self._replace_transparent_with_background(image)
+def colors_of(palette: bytes) -> List[int]:
+    return [QColor(*NESPalette[color]).rgb() for color in palette]
 
-            if selected:
-                apply_selection_overlay(image, mask)
 
-            Block._block_cache[block_attributes] = image
+def color_table_of(colors: List[int], background_color_index: int, selected=False, transparent=False) -> List[int]:
+    """
+    The colors, that the color indexes of a block are turned into.
 
-        painter.drawImage(x, y, Block._block_cache[block_attributes])
+    :param colors: The opaque colors of the palette of the block.
+    :param background_color_index: The index of the color, that is used as the background.
+    :param selected: Whether to tint all pixels, except for the background, with the selection overlay color.
+    :param transparent: Whether pixels of the background color should be transparent, instead.
+    """
+    color_table = []
 
-    def _replace_transparent_with_background(self, image):
-        # draw image on background layer, to fill transparent pixels
-        background = image.copy()
-        background.fill(self.bg_color)
-
-        _painter = QPainter(background)
-        _painter.drawImage(QPoint(), image)
-        _painter.end()
+    for color_index, color in enumerate(colors):
+        if color_index == background_color_index:
+            color_table.append(TRANSPARENT if transparent else color)
+        elif selected:
+            color_table.append(blend_with_selection_overlay(color))
+        else:
+            color_table.append(color)
 
-        return background
+    return color_table
 
 
-def _image_only_one_color(image):
-    copy = image.copy()
+def _join_tiles(lu_tile: Tile, ru_tile: Tile, ld_tile: Tile, rd_tile: Tile) -> bytes:
+    rows = []
 
-    copy.convertTo(QImage.Format_Indexed8)
+    for left_tile, right_tile in [(lu_tile, ru_tile), (ld_tile, rd_tile)]:
+        for row_start in range(0, Tile.PIXEL_COUNT, Tile.WIDTH):
+            rows.append(left_tile.pixels[row_start : row_start + Tile.WIDTH])
+            rows.append(right_tile.pixels[row_start : row_start + Tile.WIDTH])
 
-    return copy.colorCount() == 1
+    return b"".join(rows)
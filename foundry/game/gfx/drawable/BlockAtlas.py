@@ -0,0 +1,199 @@
+from typing import Dict, List, Tuple
+
+from PySide2.QtCore import QPoint, QRect, Qt
+from PySide2.QtGui import QImage, QPainter
+
+from foundry.game.File import ROM
+from foundry.game.LRUCache import LRUCache
+from foundry.game.RomCache import tsa_data_of
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import COLORS_PER_PALETTE, PaletteGroup
+from foundry.game.gfx.drawable.Block import Block, color_table_of, colors_of, resolve_block_index
+from foundry.game.gfx.drawable.Tile import background_color_index_of
+
+BLOCK_COUNT = 0x100
+BLOCKS_PER_ROW = 16
+BLOCK_ROWS = BLOCK_COUNT // BLOCKS_PER_ROW
+
+AtlasKey = Tuple[int, int, Tuple[bytes, ...]]
+
+# adds the offset of the palette of a block to its color indexes, so they index into the color table of the atlas
+_PALETTE_OFFSET_TABLES = [
+    bytes((color_index + palette_index * COLORS_PER_PALETTE) & 0xFF for color_index in range(256))
+    for palette_index in range(4)
+]
+
+
+class BlockAtlas:
+    """
+    All 256 blocks of an object set, rendered with a specific graphics set and palette group into a single image, 16
+    blocks per row, in order of their index. Drawing a block copies its part of that image. For every block length
+    other than 16 pixels, a scaled copy of the whole atlas is made once, so single blocks never need to be scaled.
+
+    The blocks are only decoded once per object set and graphics set, into an Indexed8 image, whose pixels index into
+    the colors of all 4 palettes of a palette group. Atlases of other palette groups share that image and only use a
+    different color table.
+
+    Atlases are shared. Use BlockAtlas.get() instead of creating them directly.
+    """
+
+    WIDTH = BLOCKS_PER_ROW * Block.WIDTH
+    HEIGHT = BLOCK_ROWS * Block.HEIGHT
+
+    _atlas_cache: Dict[AtlasKey, "BlockAtlas"] = {}
+    _index_image_cache = LRUCache("Block atlas indexes", max_bytes=4 * 1024 * 1024)
+    _opaque_blocks_cache: Dict[Tuple[int, int], List[bool]] = {}
+    _image_cache = LRUCache("Block atlases", max_bytes=64 * 1024 * 1024)
+    _cache_generation = -1
+
+    def __init__(self, object_set: int, palette_group: PaletteGroup, graphics_set: GraphicsSet):
+        self.object_set = object_set
+        self.palette_group = palette_group
+        self.graphics_set = graphics_set
+
+        self.tsa_data = tsa_data_of(object_set)
+
+        self.key = BlockAtlas.key_of(object_set, palette_group, graphics_set)
+
+        self.background_color_index = background_color_index_of(graphics_set)
+
+    @staticmethod
+    def key_of(object_set: int, palette_group: PaletteGroup, graphics_set: GraphicsSet) -> AtlasKey:
+        # can't hash a list of bytearrays, so turn the palettes into bytes
+        return object_set, graphics_set.number, tuple(bytes(palette) for palette in palette_group)
+
+    @staticmethod
+    def get(object_set: int, palette_group: PaletteGroup, graphics_set: GraphicsSet) -> "BlockAtlas":
+        # atlases built from outdated graphics sets or TSA data must not be reused
+        if BlockAtlas._cache_generation != ROM.generation:
+            BlockAtlas.clear_cache()
+            BlockAtlas._cache_generation = ROM.generation
+
+        key = BlockAtlas.key_of(object_set, palette_group, graphics_set)
+
+        if key not in BlockAtlas._atlas_cache:
+            BlockAtlas._atlas_cache[key] = BlockAtlas(object_set, palette_group, graphics_set)
+
+        return BlockAtlas._atlas_cache[key]
+
+    @staticmethod
+    def clear_cache():
+        BlockAtlas._atlas_cache.clear()
+        BlockAtlas._index_image_cache.clear()
+        BlockAtlas._opaque_blocks_cache.clear()
+        BlockAtlas._image_cache.clear()
+
+    @staticmethod
+    def _index_image_of(object_set: int, palette_group: PaletteGroup, graphics_set: GraphicsSet) -> QImage:
+        key = (object_set, graphics_set.number)
+
+        index_image = BlockAtlas._index_image_cache.get(key)
+
+        if index_image is None:
+            tsa_data = tsa_data_of(object_set)
+
+            # the palette group is only needed to create the blocks, their colors are not used
+            blocks = [Block(block_index, palette_group, graphics_set, tsa_data) for block_index in range(BLOCK_COUNT)]
+
+            index_image = _index_image_from_blocks(blocks)
+
+            BlockAtlas._index_image_cache[key] = index_image
+            BlockAtlas._opaque_blocks_cache[key] = [
+                block.background_color_index not in block.pixels for block in blocks
+            ]
+
+        return index_image
+
+    @property
+    def index_image(self) -> QImage:
+        return BlockAtlas._index_image_of(self.object_set, self.palette_group, self.graphics_set)
+
+    def is_opaque(self, block_index: int) -> bool:
+        """
+        Whether the block has no pixels of the background color. It then hides everything behind it, even when it is
+        drawn transparently.
+        """
+        key = (self.object_set, self.graphics_set.number)
+
+        if key not in BlockAtlas._opaque_blocks_cache:
+            BlockAtlas._index_image_of(self.object_set, self.palette_group, self.graphics_set)
+
+        return BlockAtlas._opaque_blocks_cache[key][resolve_block_index(block_index)]
+
+    @staticmethod
+    def block_rect(block_index: int, block_length: int = Block.WIDTH) -> QRect:
+        """
+        The part of the atlas image, that the block with the given index takes up.
+
+        :param block_index: The index of the block in the object set.
+        :param block_length: The side length of the blocks in the atlas image.
+        """
+        x = (block_index % BLOCKS_PER_ROW) * block_length
+        y = (block_index // BLOCKS_PER_ROW) * block_length
+
+        return QRect(x, y, block_length, block_length)
+
+    def color_table(self, selected=False, transparent=False) -> List[int]:
+        """
+        The colors of all 4 palettes of the palette group, one after the other.
+        """
+        color_table = []
+
+        for palette in self.palette_group:
+            color_table.extend(color_table_of(colors_of(palette), self.background_color_index, selected, transparent))
+
+        return color_table
+
+    def image(self, selected=False, transparent=False, block_length: int = Block.WIDTH) -> QImage:
+        image_key = (self.key, selected, transparent, block_length)
+
+        image = BlockAtlas._image_cache.get(image_key)
+
+        if image is None:
+            if block_length == Block.WIDTH:
+                # shares the pixel data with the index image, until the color table is set
+                image = QImage(self.index_image)
+                image.setColorTable(self.color_table(selected, transparent))
+
+                image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            else:
+                # fast transformation repeats or skips pixels, instead of blurring them together
+                image = self.image(selected, transparent).scaled(
+                    BLOCKS_PER_ROW * block_length,
+                    BLOCK_ROWS * block_length,
+                    Qt.IgnoreAspectRatio,
+                    Qt.FastTransformation,
+                )
+
+            BlockAtlas._image_cache[image_key] = image
+
+        return image
+
+    def draw_block(
+        self, painter: QPainter, block_index: int, x: int, y: int, block_length: int, selected=False, transparent=False
+    ):
+        block_index = resolve_block_index(block_index)
+
+        image = self.image(selected, transparent, block_length)
+
+        painter.drawImage(QPoint(x, y), image, self.block_rect(block_index, block_length))
+
+
+def _index_image_from_blocks(blocks: List[Block]) -> QImage:
+    rows = []
+
+    for block_row in range(BLOCK_ROWS):
+        row_of_blocks = blocks[block_row * BLOCKS_PER_ROW : (block_row + 1) * BLOCKS_PER_ROW]
+
+        for pixel_row_start in range(0, Block.PIXEL_COUNT, Block.WIDTH):
+            for block in row_of_blocks:
+                palette_index = (block.index & 0b1100_0000) >> 6
+
+                pixel_row = block.pixels[pixel_row_start : pixel_row_start + Block.WIDTH]
+
+                rows.append(pixel_row.translate(_PALETTE_OFFSET_TABLES[palette_index]))
+
+    pixels = b"".join(rows)
+
+    # copy, so the image owns its pixel data
+    return QImage(pixels, BlockAtlas.WIDTH, BlockAtlas.HEIGHT, BlockAtlas.WIDTH, QImage.Format_Indexed8).copy()
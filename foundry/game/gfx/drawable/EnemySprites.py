@@ -0,0 +1,75 @@
+"""
+The sprites of enemies and items are not decoded from the ROM, but taken from data/gfx.png. That file is only loaded
+once and every sprite is masked, tinted and scaled at most once per block length and selection state.
+"""
+
+from typing import Optional
+
+from PySide2.QtCore import QRect
+from PySide2.QtGui import QColor, QImage, Qt
+
+from foundry import data_dir
+from foundry.game.LRUCache import LRUCache
+from foundry.game.gfx.drawable import apply_selection_overlay
+from foundry.game.gfx.drawable.Block import Block
+
+MASK_COLOR = [0xFF, 0x33, 0xFF]
+
+SPRITES_PER_ROW = 64
+
+ROWS_PER_OBJECT_SET = 256 // SPRITES_PER_ROW
+
+# the enemy sprites come after the blocks of the 12 object sets in gfx.png
+ENEMY_SPRITES_Y_OFFSET = 12 * ROWS_PER_OBJECT_SET * Block.HEIGHT
+
+_png: Optional[QImage] = None
+
+_sprite_cache = LRUCache("Enemy sprites", max_bytes=16 * 1024 * 1024)
+
+
+def gfx_png() -> QImage:
+    """
+    The contents of data/gfx.png, which is shared and must not be changed.
+    """
+    global _png
+
+    if _png is None:
+        _png = QImage(str(data_dir.joinpath("gfx.png")))
+        _png.convertTo(QImage.Format_RGB888)
+
+    return _png
+
+
+def enemy_sprite(sprite_id: int, block_length: int = Block.SIDE_LENGTH, selected=False) -> QImage:
+    """
+    Returns the masked sprite block of an enemy or item.
+
+    :param sprite_id: An index into the object design of an enemy or item definition.
+    :param block_length: The side length of the returned image.
+    :param selected: Whether the selection overlay should be drawn onto the sprite.
+    """
+    key = (sprite_id, block_length, selected)
+
+    sprite = _sprite_cache.get(key)
+
+    if sprite is None:
+        if block_length != Block.SIDE_LENGTH:
+            sprite = enemy_sprite(sprite_id, Block.SIDE_LENGTH, selected).scaled(block_length, block_length)
+        else:
+            x = (sprite_id % SPRITES_PER_ROW) * Block.WIDTH
+            y = (sprite_id // SPRITES_PER_ROW) * Block.HEIGHT + ENEMY_SPRITES_Y_OFFSET
+
+            sprite = gfx_png().copy(QRect(x, y, Block.WIDTH, Block.HEIGHT))
+
+            mask = sprite.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
+            sprite.setAlphaChannel(mask)
+
+            # todo better effect
+            if selected:
+                apply_selection_overlay(sprite, mask)
+
+            sprite = sprite.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
+        _sprite_cache[key] = sprite
+
+    return sprite
@@ -0,0 +1,48 @@
+from PySide2.QtGui import QColor, QImage
+
+from foundry.game.RomCache import tsa_data_of
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import load_palette_group
+from foundry.game.gfx.drawable.Block import Block
+from smb3parse.objects.object_set import PLAINS_GRAPHICS_SET, PLAINS_OBJECT_SET
+
+
+def _block(block_index: int) -> Block:
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+    graphics_set = GraphicsSet.from_number(PLAINS_GRAPHICS_SET)
+
+    return Block(block_index, palette_group, graphics_set, tsa_data_of(PLAINS_OBJECT_SET))
+
+
+def test_transparency_from_color_index(qtbot):
+    # GIVEN the sky block, which consists of nothing but the background color
+    block = _block(0x80)
+
+    # WHEN rendering it transparently and opaquely
+    transparent_image = block.as_image(transparent=True)
+    opaque_image = block.as_image(transparent=False)
+
+    # THEN the block is detected as transparent from its color indexes alone
+    assert block._whole_block_is_transparent
+
+    # AND the images are premultiplied ARGB and differ in the background pixels
+    assert transparent_image.format() == QImage.Format_ARGB32_Premultiplied
+
+    assert transparent_image.pixelColor(0, 0) == QColor(0, 0, 0, 0)
+    assert opaque_image.pixelColor(0, 0) == block.bg_color
+
+
+def test_mirrored_block(qtbot):
+    # GIVEN a block and its mirrored version
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+    graphics_set = GraphicsSet.from_number(PLAINS_GRAPHICS_SET)
+
+    block = Block(0x11, palette_group, graphics_set, tsa_data_of(PLAINS_OBJECT_SET))
+    mirrored_block = Block(0x11, palette_group, graphics_set, tsa_data_of(PLAINS_OBJECT_SET), mirrored=True)
+
+    # THEN the right half of the mirrored block is the left half, flipped horizontally
+    for row_start in range(0, Block.PIXEL_COUNT, Block.WIDTH):
+        left_half = block.pixels[row_start : row_start + Block.WIDTH // 2]
+        mirrored_right_half = mirrored_block.pixels[row_start + Block.WIDTH // 2 : row_start + Block.WIDTH]
+
+        assert mirrored_right_half == left_half[::-1]
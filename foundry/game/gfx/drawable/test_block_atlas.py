@@ -0,0 +1,84 @@
+from PySide2.QtCore import QRect
+
+from foundry.game.File import CHR_ROM_OFFSET, ROM
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import load_palette_group
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
+from smb3parse.objects.object_set import PLAINS_GRAPHICS_SET, PLAINS_OBJECT_SET
+
+
+def test_atlas_is_shared(qtbot):
+    # GIVEN the same object set, palette group and graphics set twice
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+
+    # WHEN atlases are requested for them
+    first_atlas = BlockAtlas.get(PLAINS_OBJECT_SET, palette_group, GraphicsSet.from_number(PLAINS_GRAPHICS_SET))
+    second_atlas = BlockAtlas.get(PLAINS_OBJECT_SET, list(palette_group), GraphicsSet.from_number(PLAINS_GRAPHICS_SET))
+
+    # THEN they are the same object
+    assert first_atlas is second_atlas
+
+
+def test_atlas_layout(qtbot):
+    # GIVEN an atlas
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+    atlas = BlockAtlas.get(PLAINS_OBJECT_SET, palette_group, GraphicsSet.from_number(PLAINS_GRAPHICS_SET))
+
+    # WHEN looking at the position of a block in the second row
+    # THEN it matches the position, that block would have in a 16 blocks wide grid
+    assert atlas.block_rect(0x11) == QRect(Block.WIDTH, Block.HEIGHT, Block.WIDTH, Block.HEIGHT)
+
+    # AND the image of that block is the same as the one rendered by itself
+    block_image = Block(0x11, palette_group, GraphicsSet.from_number(PLAINS_GRAPHICS_SET), atlas.tsa_data).as_image()
+    atlas_image = atlas.image().copy(atlas.block_rect(0x11))
+
+    assert block_image.convertToFormat(atlas_image.format()) == atlas_image
+
+
+def test_graphics_set_is_shared(qtbot):
+    # GIVEN a graphics set from the registry
+    graphics_set = GraphicsSet.from_number(PLAINS_GRAPHICS_SET)
+
+    # WHEN asking for it again
+    # THEN the same object is returned
+    assert GraphicsSet.from_number(PLAINS_GRAPHICS_SET) is graphics_set
+
+    # WHEN the CHR data of the ROM was written to (with the same value, to not change it for other tests)
+    ROM().bulk_write(ROM().bulk_read(1, CHR_ROM_OFFSET), CHR_ROM_OFFSET)
+
+    # THEN it is read in again
+    assert GraphicsSet.from_number(PLAINS_GRAPHICS_SET) is not graphics_set
+
+
+def test_palette_change_only_swaps_colors(qtbot):
+    # GIVEN an atlas
+    graphics_set = GraphicsSet.from_number(PLAINS_GRAPHICS_SET)
+    atlas = BlockAtlas.get(PLAINS_OBJECT_SET, load_palette_group(PLAINS_OBJECT_SET, 0), graphics_set)
+
+    # WHEN an atlas for another palette group is requested
+    other_atlas = BlockAtlas.get(PLAINS_OBJECT_SET, load_palette_group(PLAINS_OBJECT_SET, 1), graphics_set)
+
+    # THEN the decoded blocks are shared and only the colors differ
+    assert other_atlas is not atlas
+    assert other_atlas.index_image is atlas.index_image
+    assert other_atlas.color_table() != atlas.color_table()
+
+
+def test_scaled_atlas(qtbot):
+    # GIVEN an atlas
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+    atlas = BlockAtlas.get(PLAINS_OBJECT_SET, palette_group, GraphicsSet.from_number(PLAINS_GRAPHICS_SET))
+
+    # WHEN it is needed at twice the size
+    block_length = 2 * Block.WIDTH
+    scaled_image = atlas.image(block_length=block_length)
+
+    # THEN every pixel of a block was doubled, instead of being interpolated
+    block_image = atlas.image().copy(atlas.block_rect(0x11))
+    scaled_block_image = scaled_image.copy(atlas.block_rect(0x11, block_length))
+
+    assert scaled_block_image == block_image.scaled(block_length, block_length)
+
+    # AND it is only scaled once
+    assert atlas.image(block_length=block_length) is scaled_image
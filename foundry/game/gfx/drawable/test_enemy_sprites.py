@@ -0,0 +1,25 @@
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.EnemySprites import enemy_sprite
+
+GOOMBA_SPRITE = 151
+
+
+def test_sprites_are_cached(qtbot):
+    # GIVEN a sprite
+    sprite = enemy_sprite(GOOMBA_SPRITE)
+
+    # WHEN asking for it again
+    # THEN it is not masked again
+    assert enemy_sprite(GOOMBA_SPRITE) is sprite
+
+
+def test_sprite_variants(qtbot):
+    # GIVEN the sprite of a goomba, that is scaled and selected
+    block_length = 2 * Block.SIDE_LENGTH
+
+    sprite = enemy_sprite(GOOMBA_SPRITE, block_length, selected=True)
+
+    # THEN it has the requested size and differs from the unselected sprite
+    assert sprite.width() == sprite.height() == block_length
+    assert sprite is enemy_sprite(GOOMBA_SPRITE, block_length, selected=True)
+    assert sprite != enemy_sprite(GOOMBA_SPRITE, block_length, selected=False)
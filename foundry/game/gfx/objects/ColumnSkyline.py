@@ -0,0 +1,86 @@
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from PySide2.QtCore import QRect
+
+if TYPE_CHECKING:
+    from foundry.game.gfx.objects.LevelObject import LevelObject
+
+
+class ColumnSkyline:
+    """
+    The rows, that level objects start at, for every column of a level.
+
+    Objects extending to the ground stop at the first row below them, at which an object before them in the level
+    starts. Instead of checking all of those objects for every row, they can look up the next row per column here.
+
+    The skyline is filled up in the order of the objects in the level, only as far as the lookups need. When an object
+    changes its size, position or place in the level, the skyline is cut back to before that object and is filled up
+    again on the next lookup.
+    """
+
+    def __init__(self):
+        self._objects: List["LevelObject"] = []
+        self._rects: List[QRect] = []
+
+        # the top rows of the objects covering a column, sorted
+        self._tops: Dict[int, List[int]] = {}
+
+    def __len__(self):
+        return len(self._objects)
+
+    def invalidate(self, index: int):
+        """
+        Removes the object at the given index in the level and all objects after it.
+        """
+        while len(self._objects) > max(0, index):
+            self._objects.pop()
+            rect = self._rects.pop()
+
+            if rect.isEmpty():
+                continue
+
+            for column in range(rect.left(), rect.right() + 1):
+                tops = self._tops[column]
+
+                del tops[bisect_left(tops, rect.top())]
+
+    def clear(self):
+        self.invalidate(0)
+
+    def fill(self, objects_ref: List["LevelObject"], index: int):
+        """
+        Makes sure, that exactly the objects before the given index are in the skyline.
+
+        :param objects_ref: The objects of the level, in order.
+        :param index: The index of the object, that wants to look up rows in the skyline.
+        """
+        self.invalidate(index)
+
+        for level_object in objects_ref[len(self._objects) : index]:
+            rect = QRect(level_object.get_rect())
+
+            self._objects.append(level_object)
+            self._rects.append(rect)
+
+            if rect.isEmpty():
+                continue
+
+            for column in range(rect.left(), rect.right() + 1):
+                insort(self._tops.setdefault(column, []), rect.top())
+
+    def first_top(self, column: int, from_row: int) -> Optional[int]:
+        """
+        Returns the first row in the column, at or below from_row, at which an object starts.
+        """
+        tops = self._tops.get(column)
+
+        if not tops:
+            return None
+
+        index = bisect_left(tops, from_row)
+
+        if index == len(tops):
+            return None
+
+        return tops[index]
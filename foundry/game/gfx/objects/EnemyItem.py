@@ -1,22 +1,53 @@
+from typing import Optional
+
 from PySide2.QtCore import QRect, QSize
-from PySide2.QtGui import QColor, QImage, QPainter, Qt
+from PySide2.QtGui import QColor, QImage, QPainter
 
 from foundry.game.ObjectDefinitions import enemy_handle_x, enemy_handle_x2, enemy_handle_y
 from foundry.game.ObjectSet import ObjectSet
-from foundry.game.gfx.Palette import NESPalette, PaletteGroup
+from foundry.game.gfx.Palette import PaletteGroup
 from foundry.game.gfx.GraphicsSet import GraphicsSet
-from foundry.game.gfx.drawable import apply_selection_overlay
 from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.EnemySprites import enemy_sprite
 from foundry.game.gfx.objects.ObjectLike import ObjectLike
-from smb3parse.objects.object_set import ENEMY_ITEM_GRAPHICS_SET, ENEMY_ITEM_OBJECT_SET
-
-MASK_COLOR = [0xFF, 0x33, 0xFF]
+from foundry.game.gfx.objects.RenderContext import RenderContext
 
 
 class EnemyObject(ObjectLike):
-    def __init__(self, data, png_data, palette_group: PaletteGroup):
+    __slots__ = (
+        "context",
+        "is_4byte",
+        "is_single_block",
+        "length",
+        "obj_index",
+        "x_position",
+        "y_position",
+        "domain",
+        "selected",
+        "name",
+        "overlay",
+        "width",
+        "height",
+        "rect",
+        "blocks",
+        "spatial_index",
+        "_bytes",
+    )
+
+    def __init__(self, data, context: RenderContext):
+        """
+        :param data: The 3 bytes of the enemy or item.
+        :param context: What the enemy shares with the other enemies and items of its level.
+        """
         super(EnemyObject, self).__init__()
 
+        self.context = context
+
+        self.spatial_index = None
+
+        # encoded by to_bytes(), until the enemy is moved or changed
+        self._bytes: Optional[bytes] = None
+
         self.is_4byte = False
         self.is_single_block = True
         self.length = 0
@@ -27,55 +58,58 @@ class EnemyObject(ObjectLike):
 
         self.domain = 0
 
-        self.graphics_set = GraphicsSet(ENEMY_ITEM_GRAPHICS_SET)
-        self.palette_group = palette_group
-
-        self.object_set = ObjectSet(ENEMY_ITEM_OBJECT_SET)
-
-        self.bg_color = NESPalette[palette_group[0][0]]
-
-        self.png_data = png_data
-
         self.selected = False
 
         self._setup()
 
     @property
-    def rect(self):
-        return QRect(
-            self.x_position + enemy_handle_x[self.obj_index],
-            self.y_position + enemy_handle_y[self.obj_index],
-            self.width,
-            self.height,
-        )
+    def object_set(self) -> ObjectSet:
+        return self.context.object_set
+
+    @property
+    def graphics_set(self) -> GraphicsSet:
+        return self.context.graphics_set
+
+    @property
+    def palette_group(self) -> PaletteGroup:
+        return self.context.palette_group
 
     def _setup(self):
         obj_def = self.object_set.get_definition_of(self.obj_index)
 
         self.name = obj_def.description
+        self.overlay = obj_def.overlay
 
         self.width = obj_def.bmp_width
         self.height = obj_def.bmp_height
 
+        self._update_rect()
+
         self._render(obj_def)
 
-    def _render(self, obj_def):
-        self.blocks = []
+    def _update_rect(self):
+        # every change of position or type ends up here
+        self._bytes = None
 
-        block_ids = obj_def.object_design
+        self.rect = QRect(
+            self.x_position + enemy_handle_x[self.obj_index],
+            self.y_position + enemy_handle_y[self.obj_index],
+            self.width,
+            self.height,
+        )
 
-        for block_id in block_ids:
-            x = (block_id % 64) * Block.WIDTH
-            y = (block_id // 64) * Block.WIDTH
+        self._rect_changed()
 
-            self.blocks.append(self.png_data.copy(QRect(x, y, Block.WIDTH, Block.HEIGHT)))
+    def _render(self, obj_def):
+        # the sprites themselves are shared between all enemies, see enemy_sprite()
+        self.blocks = list(obj_def.object_design)
 
     def render(self):
         # nothing to re-render since enemies are just copied over
         pass
 
     def draw(self, painter: QPainter, block_length, _):
-        for i, image in enumerate(self.blocks):
+        for i, sprite_id in enumerate(self.blocks):
             x = self.x_position + (i % self.width)
             y = self.y_position + (i // self.width)
 
@@ -85,19 +119,9 @@ class EnemyObject(ObjectLike):
             x += x_offset
             y += y_offset
 
-            block = image.copy()
-
-            mask = block.createMaskFromColor(QColor(*MASK_COLOR).rgb(), Qt.MaskOutColor)
-            block.setAlphaChannel(mask)
-
-            # todo better effect
-            if self.selected:
-                apply_selection_overlay(block, mask)
+            sprite = enemy_sprite(sprite_id, block_length, self.selected)
 
-            if block_length != Block.SIDE_LENGTH:
-                block = block.scaled(block_length, block_length)
-
-            painter.drawImage(x * block_length, y * block_length, block)
+            painter.drawImage(x * block_length, y * block_length, sprite)
 
     def get_status_info(self):
         return [("Name", self.name), ("X", self.x_position), ("Y", self.y_position)]
@@ -118,6 +142,8 @@ class EnemyObject(ObjectLike):
         self.x_position = x
         self.y_position = y
 
+        self._update_rect()
+
     def move_by(self, dx, dy):
         new_x = self.x_position + dx
         new_y = self.y_position + dy
@@ -149,8 +175,13 @@ class EnemyObject(ObjectLike):
 
         self._setup()
 
-    def to_bytes(self):
-        return bytearray([self.obj_index, self.x_position + int(enemy_handle_x2[self.obj_index]), self.y_position])
+    def to_bytes(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = bytes(
+                [self.obj_index, self.x_position + int(enemy_handle_x2[self.obj_index]), self.y_position]
+            )
+
+        return self._bytes
 
     def as_image(self) -> QImage:
         image = QImage(
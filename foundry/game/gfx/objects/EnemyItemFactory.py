@@ -1,10 +1,9 @@
-from PySide2.QtCore import QRect
-from PySide2.QtGui import QImage
-
-from foundry import data_dir
+from foundry.game.ObjectSet import ObjectSet
+from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import load_palette_group
-from foundry.game.gfx.drawable.Block import Block
 from foundry.game.gfx.objects.EnemyItem import EnemyObject
+from foundry.game.gfx.objects.RenderContext import RenderContext
+from smb3parse.objects.object_set import ENEMY_ITEM_GRAPHICS_SET, ENEMY_ITEM_OBJECT_SET
 
 
 class EnemyItemFactory:
@@ -14,20 +13,15 @@ class EnemyItemFactory:
     definitions: list = []
 
     def __init__(self, object_set: int, palette_index: int):
-        png = QImage(str(data_dir.joinpath("gfx.png")))
-
-        png.convertTo(QImage.Format_RGB888)
-
-        rows_per_object_set = 256 // 64
-
-        y_offset = 12 * rows_per_object_set * Block.HEIGHT
-
-        self.png_data = png.copy(QRect(0, y_offset, png.width(), png.height() - y_offset))
-
         self.palette_group = load_palette_group(object_set, palette_index)
 
+        # enemies and items always use the same object and graphics set, no matter the level
+        self.context = RenderContext(
+            ObjectSet(ENEMY_ITEM_OBJECT_SET), GraphicsSet.from_number(ENEMY_ITEM_GRAPHICS_SET), self.palette_group
+        )
+
     def from_data(self, data, _):
-        return EnemyObject(data, self.png_data, self.palette_group)
+        return EnemyObject(data, self.context)
 
     def from_properties(self, enemy_item_id: int, x: int, y: int):
         data = bytearray(3)
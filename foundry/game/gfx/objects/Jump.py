@@ -5,6 +5,18 @@ from foundry.game.gfx.objects.ObjectLike import ObjectLike
 
 
 class Jump(ObjectLike):
+    __slots__ = (
+        "data",
+        "blocks",
+        "is_4byte",
+        "name",
+        "screen_index",
+        "exit_vertical",
+        "exit_action",
+        "exit_horizontal",
+        "spatial_index",
+    )
+
     POINTER_DOMAIN = 0b111
 
     SIZE = 3  # bytes
@@ -12,6 +24,8 @@ class Jump(ObjectLike):
     def __init__(self, data):
         self.data = data
 
+        self.spatial_index = None
+
         # domain: 0b1110
         # unused: 0b0001
 
@@ -1,4 +1,4 @@
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 from warnings import warn
 
 from PySide2.QtCore import QRect, QSize
@@ -9,9 +9,12 @@ from foundry.game.ObjectDefinitions import EndType, GeneratorType
 from foundry.game.ObjectSet import ObjectSet
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import PaletteGroup, bg_color_for_object_set
-from foundry.game.gfx.drawable.Block import Block, get_block
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
+from foundry.game.gfx.objects.ColumnSkyline import ColumnSkyline
 from foundry.game.gfx.objects.EnemyItem import EnemyObject
 from foundry.game.gfx.objects.ObjectLike import EXPANDS_BOTH, EXPANDS_HORIZ, EXPANDS_NOT, EXPANDS_VERT, ObjectLike
+from foundry.game.gfx.objects.RenderContext import RenderContext
 from smb3parse.objects.object_set import PLAINS_OBJECT_SET
 
 SKY = 0
@@ -51,6 +54,28 @@ BLANK = -1
 SCREEN_HEIGHT = 15
 SCREEN_WIDTH = 16
 
+# objects of these types look different, depending on their position or the objects around them
+POSITION_DEPENDENT_GENERATORS = [
+    GeneratorType.TO_THE_SKY,
+    GeneratorType.HORIZ_TO_GROUND,
+    GeneratorType.PYRAMID_TO_GROUND,
+    GeneratorType.PYRAMID_2,
+    GeneratorType.ENDING,
+]
+
+
+class RenderedShape(NamedTuple):
+    """
+    The blocks of a rendered level object and where they are placed, relative to the position of the object.
+    """
+
+    blocks: List[int]
+    width: int
+    height: int
+    x_offset: int
+    y_offset: int
+    object_height: int
+
 
 def get_minimal_icon_object(
     level_object: Union["LevelObject", EnemyObject]
@@ -81,21 +106,57 @@ def get_minimal_icon_object(
 
 
 class LevelObject(ObjectLike):
-    def __init__(
-        self,
-        data: bytearray,
-        object_set: int,
-        palette_group: PaletteGroup,
-        graphics_set: GraphicsSet,
-        objects_ref: List["LevelObject"],
-        is_vertical: bool,
-        index: int,
-        size_minimal: bool = False,
-    ):
-        self.object_set = ObjectSet(object_set)
-
-        self.graphics_set = graphics_set
-        self.tsa_data = ROM.get_tsa_data(object_set)
+    # levels can have thousands of objects, so they don't get a __dict__
+    __slots__ = (
+        "context",
+        "data",
+        "domain",
+        "original_x",
+        "original_y",
+        "x_position",
+        "y_position",
+        "_obj_index",
+        "is_single_block",
+        "type",
+        "width",
+        "height",
+        "orientation",
+        "ending",
+        "name",
+        "overlay",
+        "overlay_item",
+        "blocks",
+        "is_4byte",
+        "_length",
+        "secondary_length",
+        "rect",
+        "rendered_base_x",
+        "rendered_base_y",
+        "rendered_width",
+        "rendered_height",
+        "rendered_blocks",
+        "index_in_level",
+        "selected",
+        "ground_level",
+        "spatial_index",
+        "_render_inputs",
+        "_stop_row",
+        "_stop_row_arguments",
+        "_bytes",
+    )
+
+    # shared between all objects with the same shape, so the rendered blocks must not be modified
+    _shape_cache: Dict[tuple, Optional[RenderedShape]] = {}
+
+    def __init__(self, data: bytearray, context: RenderContext, index: int):
+        """
+        :param data: The 3 or 4 bytes of the object.
+        :param context: What the object shares with the other objects of its level.
+        :param index: The position of the object in the objects of the level.
+        """
+        self.context = context
+
+        self.spatial_index = None
 
         self.x_position = 0
         self.y_position = 0
@@ -103,18 +164,12 @@ class LevelObject(ObjectLike):
         self.rendered_base_x = 0
         self.rendered_base_y = 0
 
-        self.palette_group = palette_group
-
         self.index_in_level = index
-        self.objects_ref = objects_ref
-        self.vertical_level = is_vertical
 
         self.data = data
 
         self.selected = False
 
-        self.size_minimal = size_minimal
-
         if self.size_minimal:
             self.ground_level = 0
         else:
@@ -123,6 +178,14 @@ class LevelObject(ObjectLike):
         self._length = 0
         self.secondary_length = 0
 
+        # what the object was last rendered with, so it is only rendered again, when one of those changes
+        self._render_inputs: Optional[tuple] = None
+        # objects extending to the ground remember where they stopped and what they need to find that row again
+        self._stop_row: Optional[int] = None
+        self._stop_row_arguments: Optional[tuple] = None
+        # encoded by to_bytes(), until the object is changed or rendered again
+        self._bytes: Optional[bytes] = None
+
         self._setup()
 
     def _setup(self):
@@ -157,11 +220,11 @@ class LevelObject(ObjectLike):
         self.orientation = GeneratorType(object_data.orientation)
         self.ending = EndType(object_data.ending)
         self.name = object_data.description
+        self.overlay = object_data.overlay
+        self.overlay_item = object_data.overlay_item
 
         self.blocks = [int(block) for block in object_data.rom_object_design]
 
-        self.block_cache = {}
-
         self.is_4byte = object_data.is_4byte
 
         if self.is_4byte and len(self.data) == 3:
@@ -178,6 +241,38 @@ class LevelObject(ObjectLike):
 
         self._render()
 
+    @property
+    def object_set(self) -> ObjectSet:
+        return self.context.object_set
+
+    @property
+    def graphics_set(self) -> GraphicsSet:
+        return self.context.graphics_set
+
+    @property
+    def palette_group(self) -> PaletteGroup:
+        return self.context.palette_group
+
+    @property
+    def tsa_data(self) -> bytes:
+        return self.context.tsa_data
+
+    @property
+    def objects_ref(self) -> List["LevelObject"]:
+        return self.context.objects_ref
+
+    @property
+    def skyline(self) -> ColumnSkyline:
+        return self.context.skyline
+
+    @property
+    def vertical_level(self) -> bool:
+        return self.context.vertical_level
+
+    @property
+    def size_minimal(self) -> bool:
+        return self.context.size_minimal
+
     @property
     def obj_index(self):
         return self._obj_index
@@ -210,6 +305,7 @@ class LevelObject(ObjectLike):
             self._obj_index |= value & 0x0F
 
         self._length = value
+        self._bytes = None
 
     def _calculate_lengths(self):
         if self.is_single_block:
@@ -222,20 +318,162 @@ class LevelObject(ObjectLike):
             self.length = self.data[3]
 
     def render(self):
+        """
+        Renders the object, if anything it depends on changed, since it was last rendered.
+
+        That is its own position, type and size, and for objects, that extend to the ground, the row at which the
+        objects before it in the level stop it from doing so.
+        """
+        if self._render_inputs == self._current_render_inputs() and not self._dependencies_changed():
+            return
+
         self._render()
 
+    def invalidate(self):
+        """
+        Makes sure the object is rendered again, on the next call to render().
+        """
+        self._render_inputs = None
+        self._bytes = None
+
+    def _current_render_inputs(self) -> tuple:
+        return (
+            self._index_in_objects_ref(),
+            self.x_position,
+            self.y_position,
+            self.type,
+            self.obj_index,
+            self.length,
+            self.secondary_length,
+            self.ground_level,
+        )
+
+    def _index_in_objects_ref(self) -> int:
+        # compares by identity, since the equality of level objects depends on their bytes, which is slow to check
+        if 0 <= self.index_in_level < len(self.objects_ref) and self.objects_ref[self.index_in_level] is self:
+            return self.index_in_level
+
+        for index, obj in enumerate(self.objects_ref):
+            if obj is self:
+                return index
+
+        # the object has not been added yet, so stick with the one given in the constructor
+        return self.index_in_level
+
+    def _dependencies_changed(self) -> bool:
+        if self._stop_row_arguments is None:
+            return False
+
+        return self._find_stop_row(*self._stop_row_arguments) != self._stop_row
+
+    def _find_stop_row(self, *args) -> Optional[int]:
+        if self.orientation == GeneratorType.HORIZ_TO_GROUND:
+            return self._first_object_top(*args)
+        else:
+            return self._pyramid_stop_row(*args)
+
+    def _first_object_top(self, columns: range, from_row: int) -> Optional[int]:
+        """
+        Returns the first row above the ground, at or below from_row, at which an object before this one starts, in any
+        of the given columns.
+        """
+        self.skyline.fill(self.objects_ref, self.index_in_level)
+
+        tops = [self.skyline.first_top(column, from_row) for column in columns]
+
+        return min((top for top in tops if top is not None and top < self.ground_level), default=None)
+
+    def _pyramid_stop_row(self, tip_x: int, tip_y: int) -> Optional[int]:
+        """
+        Returns the first row above the ground, at which an object before this one starts, underneath a pyramid growing
+        from the given tip. At row y the pyramid covers the columns tip_x up to tip_x + 2 * (y - tip_y).
+        """
+        self.skyline.fill(self.objects_ref, self.index_in_level)
+
+        last_row = self.ground_level - 1
+        stop_row = None
+
+        for column in range(tip_x, tip_x + 2 * (last_row - tip_y)):
+            first_covered_row = tip_y + (column - tip_x) // 2 + 1
+
+            if stop_row is not None and first_covered_row >= stop_row:
+                # columns further out are only covered further down
+                break
+
+            top = self.skyline.first_top(column, first_covered_row)
+
+            if top is not None and top <= last_row and (stop_row is None or top < stop_row):
+                stop_row = top
+
+        return stop_row
+
     def _render(self):
-        self.rendered_base_x = base_x = self.x_position
-        self.rendered_base_y = base_y = self.y_position
+        previous_rect = self.rect
+        previous_index = self.index_in_level
+
+        # every change of position, type or size ends up here
+        self._bytes = None
+
+        self.index_in_level = self._index_in_objects_ref()
+
+        self._stop_row = None
+        self._stop_row_arguments = None
+
+        shape_key = self._shape_key()
+
+        if shape_key in LevelObject._shape_cache:
+            shape = LevelObject._shape_cache[shape_key]
+        else:
+            shape = self._render_shape()
+
+            if shape_key is not None:
+                LevelObject._shape_cache[shape_key] = shape
+
+        if shape is None:
+            self.rendered_base_x = self.x_position
+            self.rendered_base_y = self.y_position
+            self.rendered_width = self.width
+            self.rendered_height = self.height
+            self.rendered_blocks = []
+
+            return
+
+        self.rendered_blocks = shape.blocks
+        self.rendered_width = shape.width
+        self.rendered_height = shape.height
+        self.rendered_base_x = self.x_position + shape.x_offset
+        self.rendered_base_y = self.y_position + shape.y_offset
+
+        # some objects correct their height, while rendering
+        self.height = shape.object_height
+
+        self.rect = QRect(self.rendered_base_x, self.rendered_base_y, self.rendered_width, self.rendered_height)
+
+        self._render_inputs = self._current_render_inputs()
+
+        if self.rect != previous_rect or self.index_in_level != previous_index:
+            # objects after this one might extend down to a different row now
+            self.skyline.invalidate(min(self.index_in_level, previous_index))
 
-        self.rendered_width = new_width = self.width
-        self.rendered_height = new_height = self.height
+        if self.rect != previous_rect:
+            self._rect_changed()
 
-        try:
-            self.index_in_level = self.objects_ref.index(self)
-        except ValueError:
-            # the object has not been added yet, so stick with the one given in the constructor
-            pass
+    def _shape_key(self) -> Optional[tuple]:
+        """
+        The values, that the rendered shape of the object depends on, or None, if it also depends on its position or
+        the objects around it.
+        """
+        if self.orientation in POSITION_DEPENDENT_GENERATORS or self.name.lower() == "black boss room background":
+            return None
+
+        return self.object_set.number, self.domain, self.obj_index, self.length, self.secondary_length, self.height
+
+    def _render_shape(self) -> Optional["RenderedShape"]:
+        base_x = self.x_position
+        base_y = self.y_position
+
+        new_width = self.width
+        new_height = self.height
 
         blocks_to_draw = []
 
@@ -351,8 +589,7 @@ class LevelObject(ObjectLike):
             else:
                 # todo other two ends not used with diagonals?
                 warn(f"{self.name} was not rendered.", RuntimeWarning)
-                self.rendered_blocks = []
-                return
+                return None
 
             rows = []
 
@@ -397,19 +634,15 @@ class LevelObject(ObjectLike):
 
             base_x += 1  # set the new base_x to the tip of the pyramid
 
-            for y in range(base_y, self.ground_level):
-                new_height = y - base_y
-                new_width = 2 * new_height
+            if base_y < self.ground_level:
+                self._stop_row_arguments = base_x, base_y
+                self._stop_row = stop_row = self._find_stop_row(*self._stop_row_arguments)
 
-                bottom_row = QRect(base_x, y, new_width, 1)
+                # without anything underneath it, the pyramid extends to the ground
+                last_row = self.ground_level - 1 if stop_row is None else stop_row
 
-                if any(
-                    [
-                        bottom_row.intersects(obj.get_rect()) and y == obj.get_rect().top()
-                        for obj in self.objects_ref[0 : self.index_in_level]
-                    ]
-                ):
-                    break
+                new_height = last_row - base_y
+                new_width = 2 * new_height
 
             base_x = base_x - (new_width // 2)
 
@@ -546,20 +779,14 @@ class LevelObject(ObjectLike):
 
             if self.orientation == GeneratorType.HORIZ_TO_GROUND:
                 # to the ground only, until it hits something
-                for y in range(base_y, self.ground_level):
-                    bottom_row = QRect(base_x, y, new_width, 1)
-
-                    if any(
-                        [
-                            bottom_row.intersects(obj.get_rect()) and y == obj.get_rect().top()
-                            for obj in self.objects_ref[0 : self.index_in_level]
-                        ]
-                    ):
-                        new_height = y - base_y
-                        break
-                else:
+                self._stop_row_arguments = range(base_x, base_x + new_width), base_y
+                self._stop_row = stop_row = self._find_stop_row(*self._stop_row_arguments)
+
+                if stop_row is None:
                     # nothing underneath this object, extend to the ground
                     new_height = self.ground_level - base_y
+                else:
+                    new_height = stop_row - base_y
 
                 if self.is_single_block:
                     new_width = self.length
@@ -690,36 +917,39 @@ class LevelObject(ObjectLike):
                 blocks_to_draw = SCREEN_WIDTH * SCREEN_HEIGHT * [self.blocks[0]]
 
         # for not yet implemented objects and single block objects
-        if blocks_to_draw:
-            self.rendered_blocks = blocks_to_draw
-        else:
-            self.rendered_blocks = self.blocks
+        if not blocks_to_draw:
+            blocks_to_draw = self.blocks
 
-        self.rendered_width = new_width
-        self.rendered_height = new_height
-        self.rendered_base_x = base_x
-        self.rendered_base_y = base_y
+        rendered_height = new_height
 
-        if new_width and not self.rendered_height == len(self.rendered_blocks) / new_width:
+        if new_width and not new_height == len(blocks_to_draw) / new_width:
             warn(
                 f"Not enough Blocks for calculated height: {self.name}. "
-                f"Blocks for height: {len(self.rendered_blocks) / new_width}. Rendered height: {self.rendered_height}",
+                f"Blocks for height: {len(blocks_to_draw) / new_width}. Rendered height: {new_height}",
                 RuntimeWarning,
             )
 
-            self.rendered_height = len(self.rendered_blocks) / new_width
+            rendered_height = len(blocks_to_draw) / new_width
         elif new_width == 0:
             warn(
                 f"Calculated Width is 0, setting to 1: {self.name}. "
-                f"Blocks to draw: {len(self.rendered_blocks)}. Rendered height: {self.rendered_height}",
+                f"Blocks to draw: {len(blocks_to_draw)}. Rendered height: {new_height}",
                 RuntimeWarning,
             )
 
-            self.rendered_width = 1
+            new_width = 1
 
-        self.rect = QRect(self.rendered_base_x, self.rendered_base_y, self.rendered_width, self.rendered_height)
+        return RenderedShape(
+            blocks_to_draw, new_width, rendered_height, base_x - self.x_position, base_y - self.y_position, self.height
+        )
+
+    @property
+    def block_atlas(self) -> BlockAtlas:
+        return BlockAtlas.get(self.object_set.number, self.palette_group, self.graphics_set)
 
     def draw(self, painter: QPainter, block_length, transparent):
+        block_atlas = self.block_atlas
+
         for index, block_index in enumerate(self.rendered_blocks):
             if block_index == BLANK:
                 continue
@@ -727,20 +957,15 @@ class LevelObject(ObjectLike):
             x = self.rendered_base_x + index % self.rendered_width
             y = self.rendered_base_y + index // self.rendered_width
 
-            self._draw_block(painter, block_index, x, y, block_length, transparent)
-
-    def _draw_block(self, painter: QPainter, block_index, x, y, block_length, transparent):
-        if block_index not in self.block_cache:
-            self.block_cache[block_index] = get_block(block_index, self.palette_group, self.graphics_set, self.tsa_data)
-
-        self.block_cache[block_index].draw(
-            painter,
-            x * block_length,
-            y * block_length,
-            block_length=block_length,
-            selected=self.selected,
-            transparent=transparent,
-        )
+            block_atlas.draw_block(
+                painter,
+                block_index,
+                x * block_length,
+                y * block_length,
+                block_length=block_length,
+                selected=self.selected,
+                transparent=transparent,
+            )
 
     def set_position(self, x, y):
         # todo also check for the upper bounds
@@ -958,9 +1183,22 @@ class LevelObject(ObjectLike):
 
         self.draw(painter, Block.SIDE_LENGTH, True)
 
+        # the rendered position was changed for the image, so don't keep it
+        self.invalidate()
+
         return image
 
-    def to_bytes(self) -> bytearray:
+    def to_bytes(self) -> bytes:
+        """
+        Returns the bytes of the object, as they are stored in the level. They are cached until the object changes, so
+        an unchanged object returns the same bytes object every time.
+        """
+        if self._bytes is None:
+            self._bytes = bytes(self._encode())
+
+        return self._bytes
+
+    def _encode(self) -> bytearray:
         data = bytearray()
 
         if self.vertical_level:
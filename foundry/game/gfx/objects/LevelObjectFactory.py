@@ -1,7 +1,10 @@
 from typing import Optional, List
 
+from foundry.game.ObjectSet import ObjectSet
+from foundry.game.gfx.objects.ColumnSkyline import ColumnSkyline
 from foundry.game.gfx.objects.Jump import Jump
 from foundry.game.gfx.objects.LevelObject import LevelObject, SCREEN_HEIGHT, SCREEN_WIDTH
+from foundry.game.gfx.objects.RenderContext import RenderContext
 from foundry.game.gfx.Palette import load_palette_group
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 
@@ -22,25 +25,52 @@ class LevelObjectFactory:
         objects_ref: List[LevelObject],
         vertical_level: bool,
         size_minimal: bool = False,
+        skyline: Optional[ColumnSkyline] = None,
     ):
+        self._context: Optional[RenderContext] = None
+
         self.set_object_set(object_set)
         self.set_graphic_set(graphic_set)
         self.set_palette_group_index(palette_group_index)
         self.objects_ref = objects_ref
         self.vertical_level = vertical_level
 
+        # all objects in objects_ref need to share the same skyline
+        self.skyline = ColumnSkyline() if skyline is None else skyline
+
         self.size_minimal = size_minimal
 
     def set_object_set(self, object_set: int):
         self.object_set = object_set
+        self._context = None
 
     def set_graphic_set(self, graphic_set: int):
         self.graphic_set = graphic_set
-        self.graphics_set = GraphicsSet(self.graphic_set)
+        self.graphics_set = GraphicsSet.from_number(self.graphic_set)
+        self._context = None
 
     def set_palette_group_index(self, palette_group_index: int):
         self.palette_group_index = palette_group_index
         self.palette_group = load_palette_group(self.object_set, self.palette_group_index)
+        self._context = None
+
+    @property
+    def context(self) -> RenderContext:
+        """
+        The render context shared by all objects created by this factory, until one of its settings changes.
+        """
+        if self._context is None:
+            self._context = RenderContext(
+                ObjectSet(self.object_set),
+                self.graphics_set,
+                self.palette_group,
+                self.objects_ref,
+                self.vertical_level,
+                self.skyline,
+                self.size_minimal,
+            )
+
+        return self._context
 
     def from_data(self, data: bytearray, index: int):
         if Jump.is_jump(data):
@@ -49,16 +79,7 @@ class LevelObjectFactory:
         assert self.graphics_set is not None
 
         # todo get rid of index by fixing ground map
-        return LevelObject(
-            data,
-            self.object_set,
-            self.palette_group,
-            self.graphics_set,
-            self.objects_ref,
-            self.vertical_level,
-            index,
-            size_minimal=self.size_minimal,
-        )
+        return LevelObject(data, self.context, index)
 
     def from_properties(
         self,
@@ -1,5 +1,6 @@
 from PySide2.QtCore import QRect
 
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
 from foundry.game.gfx.objects.ObjectLike import ObjectLike
 
 map_object_names = {
@@ -131,18 +132,19 @@ map_object_names = {
 
 
 class MapObject(ObjectLike):
-    def __init__(self, block, x, y):
+    def __init__(self, block_atlas: BlockAtlas, block_index: int, x, y):
         self.x_position = x
         self.y_position = y
 
-        self.block = block
+        self.block_atlas = block_atlas
+        self.block_index = block_index
 
         self.rect = QRect(self.x_position, self.y_position, 1, 1)
 
-        if self.block.index in map_object_names:
-            self.name = map_object_names[self.block.index]
+        if self.block_index in map_object_names:
+            self.name = map_object_names[self.block_index]
         else:
-            self.name = str(hex(self.block.index))
+            self.name = str(hex(self.block_index))
 
         self.selected = False
 
@@ -155,6 +157,8 @@ class MapObject(ObjectLike):
         self.x_position = x
         self.y_position = y
 
+        self._rect_changed()
+
     def get_position(self):
         return self.x_position, self.y_position
 
@@ -162,8 +166,9 @@ class MapObject(ObjectLike):
         pass
 
     def draw(self, dc, block_length, _=None):
-        self.block.draw(
+        self.block_atlas.draw_block(
             dc,
+            self.block_index,
             self.x_position * block_length,
             self.y_position * block_length,
             block_length=block_length,
@@ -175,7 +180,7 @@ class MapObject(ObjectLike):
         return ("x", self.x_position), ("y", self.y_position), ("Block Type", self.name)
 
     def to_bytes(self):
-        return self.block.index
+        return self.block_index
 
     def move_by(self, dx, dy):
         self.set_position(self.x_position + dx, self.y_position + dy)
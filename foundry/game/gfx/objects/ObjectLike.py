@@ -1,7 +1,11 @@
 import abc
+from typing import TYPE_CHECKING, Optional
 
 from PySide2.QtCore import QRect
 
+if TYPE_CHECKING:
+    from foundry.game.level.SpatialIndex import SpatialIndex
+
 EXPANDS_NOT = 0b00
 EXPANDS_HORIZ = 0b01
 EXPANDS_VERT = 0b10
@@ -9,6 +13,9 @@ EXPANDS_BOTH = EXPANDS_HORIZ | EXPANDS_VERT
 
 
 class ObjectLike(abc.ABC):
+    # so subclasses with __slots__ don't get a __dict__ anyway
+    __slots__ = ()
+
     obj_index: int
     domain: int
     name: str
@@ -17,6 +24,9 @@ class ObjectLike(abc.ABC):
 
     is_4byte: bool
 
+    # set by the spatial index of the level, when the object is added to it
+    spatial_index: Optional["SpatialIndex"] = None
+
     @abc.abstractmethod
     def render(self):
         pass
@@ -63,6 +73,10 @@ class ObjectLike(abc.ABC):
         else:
             return self.rect
 
+    def _rect_changed(self):
+        if self.spatial_index is not None:
+            self.spatial_index.update(self)
+
     @abc.abstractmethod
     def change_type(self, new_type):
         pass
@@ -0,0 +1,62 @@
+from typing import TYPE_CHECKING, List, Optional
+
+from foundry.game.ObjectSet import ObjectSet
+from foundry.game.RomCache import tsa_data_of
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import PaletteGroup
+from foundry.game.gfx.objects.ColumnSkyline import ColumnSkyline
+
+if TYPE_CHECKING:
+    from foundry.game.gfx.objects.LevelObject import LevelObject
+
+
+class RenderContext:
+    """
+    Everything the objects of a level need to render and draw themselves, that is the same for all of them. Objects
+    only keep a reference to the context of the factory, that created them, instead of a copy of all of it.
+
+    A context is never changed after it was created. When the graphics of a level change, its objects get a new one.
+    """
+
+    __slots__ = (
+        "object_set",
+        "graphics_set",
+        "palette_group",
+        "objects_ref",
+        "vertical_level",
+        "skyline",
+        "size_minimal",
+    )
+
+    def __init__(
+        self,
+        object_set: ObjectSet,
+        graphics_set: GraphicsSet,
+        palette_group: PaletteGroup,
+        objects_ref: Optional[List["LevelObject"]] = None,
+        vertical_level: bool = False,
+        skyline: Optional[ColumnSkyline] = None,
+        size_minimal: bool = False,
+    ):
+        """
+        :param object_set: The object set of the level.
+        :param graphics_set: The graphics set to draw the objects with.
+        :param palette_group: The palette group to draw the objects with.
+        :param objects_ref: The objects of the level, in order.
+        :param vertical_level: Whether the positions of the objects are stored in the vertical level format.
+        :param skyline: The skyline of the objects in objects_ref, shared by all of them.
+        :param size_minimal: Whether objects should be rendered as small as possible, for example as an icon.
+        """
+        self.object_set = object_set
+        self.graphics_set = graphics_set
+        self.palette_group = palette_group
+
+        self.objects_ref = [] if objects_ref is None else objects_ref
+        self.vertical_level = vertical_level
+        self.skyline = ColumnSkyline() if skyline is None else skyline
+
+        self.size_minimal = size_minimal
+
+    @property
+    def tsa_data(self) -> bytes:
+        return tsa_data_of(self.object_set.number)
@@ -0,0 +1,50 @@
+from foundry.game.gfx.objects.LevelObjectFactory import LevelObjectFactory
+
+
+def _level_objects():
+    objects = []
+    object_factory = LevelObjectFactory(1, 1, 0, objects, False)
+
+    # flat ground at rows 20 and 15
+    objects.append(object_factory.from_properties(0x00, 0xC0, 0, 20, None, 0))
+    objects.append(object_factory.from_properties(0x00, 0xC0, 0, 15, None, 1))
+
+    return objects, object_factory.skyline
+
+
+def test_first_top():
+    # GIVEN a skyline with two objects in the same column
+    objects, skyline = _level_objects()
+
+    # WHEN it is filled with them
+    skyline.fill(objects, len(objects))
+
+    # THEN the rows they start at can be looked up
+    assert skyline.first_top(0, 0) == 15
+    assert skyline.first_top(0, 16) == 20
+    assert skyline.first_top(0, 21) is None
+
+
+def test_only_earlier_objects():
+    # GIVEN a skyline
+    objects, skyline = _level_objects()
+
+    # WHEN it is filled for the second object
+    skyline.fill(objects, 1)
+
+    # THEN only the first object is in it
+    assert len(skyline) == 1
+    assert skyline.first_top(0, 0) == 20
+
+
+def test_moved_object():
+    # GIVEN a filled skyline
+    objects, skyline = _level_objects()
+    skyline.fill(objects, len(objects))
+
+    # WHEN an object in it is moved
+    objects[1].set_position(0, 10)
+    skyline.fill(objects, len(objects))
+
+    # THEN the skyline is updated
+    assert skyline.first_top(0, 0) == 10
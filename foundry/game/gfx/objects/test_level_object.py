@@ -153,6 +153,74 @@ def test_change_attribute_to_bytes(attribute, increase):
     assert cloud_object.to_bytes() != initial_bytes
 
 
+def test_render_only_on_change():
+    # GIVEN a platform, that extends down to the ground object below it
+    objects = []
+    object_factory = LevelObjectFactory(1, 1, 0, objects, False)
+
+    ground = object_factory.from_properties(0x00, 0xC0, 0, 20, None, 0)
+    platform = object_factory.from_properties(0x00, 0x10, 0, 10, None, 1)
+
+    objects.extend([ground, platform])
+
+    platform.render()
+    rendered_blocks = platform.rendered_blocks
+
+    # WHEN nothing changed
+    platform.render()
+
+    # THEN the platform is not rendered again
+    assert platform.rendered_blocks is rendered_blocks
+
+    # WHEN the ground is moved up
+    ground.set_position(0, 15)
+    platform.render()
+
+    # THEN the platform is rendered again and stops at its new position
+    assert platform.rendered_blocks is not rendered_blocks
+    assert platform.get_rect().bottom() == 14
+
+
+def test_shared_shape():
+    # GIVEN two floating platforms of the same size at different positions
+    object_factory = LevelObjectFactory(1, 1, 0, [], False)
+
+    first_object = object_factory.from_properties(0x00, 0x53, 0, 10, None, 0)
+    second_object = object_factory.from_properties(0x00, 0x53, 20, 5, None, 1)
+
+    # WHEN they are rendered
+    first_object.render()
+    second_object.render()
+
+    # THEN they share their blocks, but are placed at their own positions
+    assert first_object.rendered_blocks is second_object.rendered_blocks
+    assert first_object.get_rect().size() == second_object.get_rect().size()
+    assert second_object.get_rect().topLeft().toTuple() == (20, 5)
+
+
+def test_shared_render_context():
+    # GIVEN an object factory
+    object_factory = LevelObjectFactory(1, 1, 0, [], False)
+
+    # WHEN it creates two objects
+    first_object = object_factory.from_properties(0x00, 0x53, 0, 10, None, 0)
+    second_object = object_factory.from_properties(0x00, 0x53, 20, 5, None, 1)
+
+    # THEN they share the render context of the factory and don't keep copies of it
+    assert first_object.context is second_object.context is object_factory.context
+    assert first_object.palette_group is object_factory.palette_group
+    assert not hasattr(first_object, "__dict__")
+
+    # WHEN the palette group of the factory changes
+    object_factory.set_palette_group_index(1)
+
+    # THEN new objects get a new render context
+    third_object = object_factory.from_properties(0x00, 0x53, 40, 5, None, 2)
+
+    assert third_object.context is not first_object.context
+    assert third_object.palette_group is object_factory.palette_group
+
+
 def gen_object_factories():
     ROM(root_dir.joinpath("SMB3.nes"))
 
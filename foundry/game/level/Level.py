@@ -1,9 +1,10 @@
-from typing import List, Optional, Tuple, Union, overload
+from typing import Iterator, List, Optional, Tuple, Union, overload
 
 from PySide2.QtCore import QObject, QPoint, QRect, QSize, Signal, SignalInstance
 
 from foundry.game.File import ROM
 from foundry.game.ObjectSet import ObjectSet
+from foundry.game.gfx.objects.ColumnSkyline import ColumnSkyline
 from foundry.game.gfx.objects.EnemyItem import EnemyObject
 from foundry.game.gfx.objects.EnemyItemFactory import EnemyItemFactory
 from foundry.game.gfx.objects.Jump import Jump
@@ -11,6 +12,8 @@ from foundry.game.gfx.objects.LevelObject import LevelObject
 from foundry.game.gfx.objects.LevelObjectFactory import LevelObjectFactory
 from foundry.game.level import LevelByteData, _load_level_offsets
 from foundry.game.level.LevelLike import LevelLike
+from foundry.game.level.ObjectRecords import ObjectRecords
+from foundry.game.level.SpatialIndex import SpatialIndex
 from foundry.gui.UndoStack import UndoStack
 from smb3parse.constants import BASE_OFFSET, Level_TilesetIdx_ByTileset
 from smb3parse.levels.level_header import LevelHeader
@@ -24,6 +27,48 @@ TIME_INF = -1
 LEVEL_DEFAULT_HEIGHT = 27
 LEVEL_DEFAULT_WIDTH = 16
 
+# object or enemy data, ending with a 0xFF; views into the ROM are not copied, while parsing
+LevelData = Union[bytes, bytearray, memoryview]
+
+
+def _enemy_records(data: LevelData) -> Iterator[bytearray]:
+    """
+    Yields the bytes of every enemy and item in the data, up to the 0xFF at its end. Only the bytes of the records
+    themselves are copied.
+    """
+    with memoryview(data) as data_view:
+        # the stock ROM seems to follow more patterns, but a ROM already edited with another editor might not, since
+        # they only wrote the 0xFF to end the enemy data
+
+        for position in range(0, len(data_view), ENEMY_SIZE):
+            if data_view[position] == 0xFF:
+                break
+
+            yield bytearray(data_view[position : position + ENEMY_SIZE])
+
+
+def _patched(buffer: bytearray, old_parts: List[bytes], new_parts: List[bytes]) -> bytearray:
+    """
+    Returns the new parts joined together. If they have the same sizes as the old parts, that the buffer was joined
+    from, only the parts that are not the same objects as before are written into the buffer.
+
+    :param buffer: The old parts joined together.
+    :param old_parts: The bytes of the objects, when the buffer was last joined or patched.
+    :param new_parts: The current bytes of the objects. Unchanged objects return the same bytes objects as before.
+    """
+    if len(old_parts) != len(new_parts) or any(len(old) != len(new) for old, new in zip(old_parts, new_parts)):
+        return bytearray().join(new_parts)
+
+    position = 0
+
+    for old_part, new_part in zip(old_parts, new_parts):
+        if new_part is not old_part:
+            buffer[position : position + len(new_part)] = new_part
+
+        position += len(new_part)
+
+    return buffer
+
 
 def world_and_level_for_level_address(level_address: int):
     for level in Level.offsets[1:]:
@@ -68,11 +113,25 @@ class Level(LevelLike):
         self.object_offset = self.header_offset + Level.HEADER_LENGTH
         self.enemy_offset = enemy_data_offset
 
-        self.objects: List[LevelObject] = []
+        # parsed level objects are only turned into LevelObjects, when they are first needed
+        self._objects: List[LevelObject] = []
+        self._object_records = ObjectRecords()
+
+        # the last serialized objects and enemies, so to_bytes() only has to redo the parts, that changed since
+        self._object_buffer = bytearray()
+        self._object_parts: List[bytes] = []
+
+        self._enemy_buffer = bytearray()
+        self._enemy_parts: List[bytes] = []
+        self._enemies_vertical = False
+
+        self.skyline = ColumnSkyline()
         self.header_bytes: bytearray = bytearray()
         self.jumps: List[Jump] = []
         self.enemies: List[EnemyObject] = []
 
+        self._spatial_index = SpatialIndex()
+
         if self.layout_address == self.enemy_offset == 0:
             # probably loaded to become an m3l
             return
@@ -82,15 +141,18 @@ class Level(LevelLike):
         self.header_bytes = rom.bulk_read(Level.HEADER_LENGTH, self.header_offset)
         self._parse_header()
 
-        object_data = ROM.rom_data[self.object_offset :]
-        enemy_data = ROM.rom_data[self.enemy_offset :]
+        # parse the level right out of the ROM, instead of copying everything after its start
+        rom_data = memoryview(ROM.rom_data)
 
-        self._load_level_data(object_data, enemy_data)
+        self._load_level_data(rom_data[self.object_offset :], rom_data[self.enemy_offset :])
 
-    def _load_level_data(self, object_data: bytearray, enemy_data: bytearray, new_level: bool = True):
+    def _load_level_data(self, object_data: LevelData, enemy_data: LevelData, new_level: bool = True):
         self._load_objects(object_data)
         self._load_enemies(enemy_data)
 
+        # rebuilt, once it is used, so the objects don't have to be created for it now
+        self._spatial_index.clear()
+
         if new_level:
             self._update_level_size()
 
@@ -145,9 +207,9 @@ class Level(LevelLike):
         self.data_changed.emit()
 
     def current_object_size(self):
-        size = 0
+        size = self._object_records.byte_length
 
-        for obj in self.objects:
+        for obj in self._objects:
             if obj.is_4byte:
                 size += 4
             else:
@@ -167,8 +229,9 @@ class Level(LevelLike):
             self.object_set_number,
             self.header.graphic_set_index,
             self.header.object_palette_index,
-            self.objects,
+            self._objects,
             bool(self.header.is_vertical),
+            skyline=self.skyline,
         )
         self.enemy_item_factory = EnemyItemFactory(self.object_set_number, self.header.enemy_palette_index)
 
@@ -176,52 +239,104 @@ class Level(LevelLike):
 
         self.data_changed.emit()
 
-    def _load_enemies(self, data: bytearray):
-        self.enemies.clear()
+    def _update_object_graphics(self):
+        """
+        Gives the objects the render context with the palette group and graphics set of the current header. Their
+        blocks stay the same, so they don't have to be reloaded.
+        """
+        # objects, that were not created yet, will be created with it
+        context = self.object_factory.context
 
-        def data_left(_data: bytearray):
-            # the commented out code seems to hold for the stock ROM, but if the ROM was already edited with another
-            # editor, it might not, since they only wrote the 0xFF to end the enemy data
+        for level_object in self._objects:
+            level_object.context = context
 
-            return _data and not _data[0] == 0xFF  # and _data[1] in [0x00, 0x01]
+        self.data_changed.emit()
 
-        enemy_data, data = data[0:ENEMY_SIZE], data[ENEMY_SIZE:]
+    def _load_enemies(self, data: LevelData):
+        self.enemies.clear()
 
-        while data_left(enemy_data):
+        for enemy_data in _enemy_records(data):
             enemy = self.enemy_item_factory.from_data(enemy_data, 0)
 
             self.enemies.append(enemy)
 
-            enemy_data, data = data[0:ENEMY_SIZE], data[ENEMY_SIZE:]
+    @property
+    def objects(self) -> List[LevelObject]:
+        if self._object_records:
+            self._create_objects()
+
+        return self._objects
 
-    def _load_objects(self, data: bytearray):
-        self.objects.clear()
+    def _load_objects(self, data: LevelData):
+        self._objects.clear()
+        self._object_records = ObjectRecords()
+        self.skyline.clear()
         self.jumps.clear()
 
-        if not data or data[0] == 0xFF:
-            return
+        for obj_data in self._object_records_in(data):
+            if Jump.is_jump(obj_data):
+                self.jumps.append(Jump(obj_data))
+            else:
+                self._object_records.append(obj_data)
 
-        while True:
-            obj_data, data = data[0:3], data[3:]
+    def _create_objects(self):
+        """
+        Turns the parsed object records into LevelObjects.
+        """
+        object_records, self._object_records = self._object_records, ObjectRecords()
 
-            domain = (obj_data[0] & 0b1110_0000) >> 5
+        for index, obj_data in enumerate(object_records):
+            self._objects.append(self.object_factory.from_data(obj_data, index))
 
-            obj_id = obj_data[2]
-            has_length_byte = self.object_set.get_object_byte_length(domain, obj_id) == 4
+    def _object_bytes(self) -> bytearray:
+        object_parts = [obj.to_bytes() for obj in self._objects]
 
-            if has_length_byte:
-                fourth_byte, data = data[0], data[1:]
-                obj_data.append(fourth_byte)
+        self._object_buffer = _patched(self._object_buffer, self._object_parts, object_parts)
+        self._object_parts = object_parts
 
-            level_object = self.object_factory.from_data(obj_data, len(self.objects))
+        return self._object_records.to_bytes() + self._object_buffer
+
+    def _enemy_bytes(self) -> bytearray:
+        """
+        Returns the bytes of the enemies, sorted by their position along the level, like the game expects them. They
+        are only sorted again, if an enemy changed, was added, removed or moved in the list, or the level changed its
+        direction.
+        """
+        enemy_parts = [enemy.to_bytes() for enemy in self.enemies]
+
+        if (
+            self.is_vertical != self._enemies_vertical
+            or len(enemy_parts) != len(self._enemy_parts)
+            or any(new_part is not old_part for old_part, new_part in zip(self._enemy_parts, enemy_parts))
+        ):
+            if self.is_vertical:
+                sorted_enemies = sorted(self.enemies, key=lambda _enemy: _enemy.y_position)
+            else:
+                sorted_enemies = sorted(self.enemies, key=lambda _enemy: _enemy.x_position)
 
-            if isinstance(level_object, LevelObject):
-                self.objects.append(level_object)
-            elif isinstance(level_object, Jump):
-                self.jumps.append(level_object)
+            self._enemy_buffer = bytearray().join(enemy.to_bytes() for enemy in sorted_enemies)
+            self._enemy_parts = enemy_parts
+            self._enemies_vertical = self.is_vertical
 
-            if data[0] == 0xFF:
-                break
+        return self._enemy_buffer + b"\xFF"
+
+    def _object_records_in(self, data: LevelData) -> Iterator[bytearray]:
+        """
+        Yields the 3 or 4 bytes of every object and jump in the data, up to the 0xFF at its end. Only the bytes of the
+        records themselves are copied.
+        """
+        with memoryview(data) as data_view:
+            position = 0
+
+            while position < len(data_view) and data_view[position] != 0xFF:
+                domain = (data_view[position] & 0b1110_0000) >> 5
+                obj_id = data_view[position + 2]
+
+                record_length = self.object_set.get_object_byte_length(domain, obj_id)
+
+                yield bytearray(data_view[position : position + record_length])
+
+                position += record_length
 
     def _update_level_size(self):
         self.object_size_on_disk = self.current_object_size()
@@ -373,7 +488,7 @@ class Level(LevelLike):
 
         self._parse_header()
 
-        self.reload()
+        self._update_object_graphics()
 
     @property
     def pipe_ends_level(self):
@@ -459,7 +574,7 @@ class Level(LevelLike):
 
         self._parse_header()
 
-        self.reload()
+        self._update_object_graphics()
 
     @property
     def time_index(self):
@@ -506,12 +621,25 @@ class Level(LevelLike):
     def get_object_names(self):
         return [obj.name for obj in self.get_all_objects()]
 
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        if len(self._spatial_index) != len(self.objects) + len(self.enemies):
+            # objects were added to or removed from the lists directly
+            self._rebuild_spatial_index()
+
+        return self._spatial_index
+
+    def _rebuild_spatial_index(self):
+        self._spatial_index.rebuild(self.get_all_objects())
+
     def object_at(self, x: int, y: int) -> Optional[Union[EnemyObject, LevelObject]]:
-        for obj in reversed(self.get_all_objects()):
-            if (x, y) in obj:
-                return obj
-        else:
-            return None
+        return self.spatial_index.object_at(x, y)
+
+    def objects_intersecting(self, rect: QRect) -> List[Union[LevelObject, EnemyObject]]:
+        """
+        Returns all objects and enemies, that overlap the given rect, in the order, that they appear in, in memory.
+        """
+        return self.spatial_index.objects_intersecting(rect)
 
     def bring_to_foreground(self, objects: List[Union[LevelObject, EnemyObject]]):
         for obj in objects:
@@ -527,12 +655,18 @@ class Level(LevelLike):
             elif isinstance(obj, EnemyObject):
                 objects = self.enemies
 
+            old_index = objects.index(obj)
             objects.remove(obj)
 
             index = objects.index(object_currently_in_the_foreground) + 1
 
             objects.insert(index, obj)
 
+            if objects is self.objects:
+                self.skyline.invalidate(min(old_index, index))
+
+            self._rebuild_spatial_index()
+
     def bring_to_background(self, level_objects: List[Union[LevelObject, EnemyObject]]):
         for obj in level_objects:
             intersecting_objects = self.get_intersecting_objects(obj)
@@ -549,12 +683,18 @@ class Level(LevelLike):
             else:
                 raise TypeError()
 
+            old_index = objects.index(obj)
             objects.remove(obj)
 
             index = objects.index(object_currently_in_the_background)
 
             objects.insert(index, obj)
 
+            if objects is self.objects:
+                self.skyline.invalidate(min(old_index, index))
+
+            self._rebuild_spatial_index()
+
     @overload
     def get_intersecting_objects(self, obj: LevelObject) -> List[LevelObject]:
         ...
@@ -573,20 +713,14 @@ class Level(LevelLike):
         :param obj: The object to check overlaps for.
         :return:
         """
-        if isinstance(obj, LevelObject):
-            objects_to_check = self.objects
-        elif isinstance(obj, EnemyObject):
-            objects_to_check = self.enemies
-        else:
+        if not isinstance(obj, (LevelObject, EnemyObject)):
             raise TypeError()
 
-        intersecting_objects = []
-
-        for other_object in objects_to_check:
-            if obj.get_rect().intersects(other_object.get_rect()):
-                intersecting_objects.append(other_object)
-
-        return intersecting_objects
+        return [
+            other_object
+            for other_object in self.objects_intersecting(obj.get_rect())
+            if isinstance(other_object, type(obj))
+        ]
 
     def draw(self, *_):
         pass
@@ -619,6 +753,9 @@ class Level(LevelLike):
         obj = self.object_factory.from_properties(domain, object_index, x, y, length, index)
         self.objects.insert(index, obj)
 
+        self.skyline.invalidate(index)
+        self._rebuild_spatial_index()
+
         return obj
 
     def add_enemy(self, object_index: int, x: int, y: int, index: int = -1) -> EnemyObject:
@@ -631,6 +768,8 @@ class Level(LevelLike):
 
         self.enemies.insert(index, enemy)
 
+        self._rebuild_spatial_index()
+
         return enemy
 
     def add_jump(self):
@@ -662,10 +801,13 @@ class Level(LevelLike):
             return
 
         if isinstance(obj, LevelObject):
+            self.skyline.invalidate(self.objects.index(obj))
             self.objects.remove(obj)
         elif isinstance(obj, EnemyObject):
             self.enemies.remove(obj)
 
+        self._rebuild_spatial_index()
+
     def to_m3l(self) -> bytearray:
         world_number = level_number = 1
 
@@ -677,8 +819,10 @@ class Level(LevelLike):
 
         m3l_bytes.extend(self.header_bytes)
 
-        for obj in self.objects + self.jumps:
-            m3l_bytes.extend(obj.to_bytes())
+        m3l_bytes.extend(self._object_bytes())
+
+        for jump in self.jumps:
+            m3l_bytes.extend(jump.to_bytes())
 
         # only write 0xFF, even though the stock ROM would use 0xFF00 or 0xFF01
         # this is done to keep compatibility to older editors
@@ -730,28 +874,14 @@ class Level(LevelLike):
         data = bytearray()
 
         data.extend(self.header_bytes)
-
-        for obj in self.objects:
-            data.extend(obj.to_bytes())
+        data.extend(self._object_bytes())
 
         for jump in self.jumps:
             data.extend(jump.to_bytes())
 
         data.append(0xFF)
 
-        enemies = bytearray()
-
-        if self.is_vertical:
-            enemies_objects = sorted(self.enemies, key=lambda _enemy: _enemy.y_position)
-        else:
-            enemies_objects = sorted(self.enemies, key=lambda _enemy: _enemy.x_position)
-
-        for enemy in enemies_objects:
-            enemies.extend(enemy.to_bytes())
-
-        enemies.append(0xFF)
-
-        return (self.header_offset, data), (self.enemy_offset, enemies)
+        return (self.header_offset, data), (self.enemy_offset, self._enemy_bytes())
 
     def from_bytes(self, object_data: Tuple[int, bytearray], enemy_data: Tuple[int, bytearray], new_level=True):
 
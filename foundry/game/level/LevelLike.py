@@ -20,6 +20,10 @@ class LevelLike(LevelBase, abc.ABC):
     def object_at(self, x, y):
         pass
 
+    @abc.abstractmethod
+    def objects_intersecting(self, rect):
+        pass
+
     @abc.abstractmethod
     def get_object_names(self):
         pass
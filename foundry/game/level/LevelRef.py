@@ -8,6 +8,8 @@ from foundry.game.level.Level import Level
 class LevelRef(QObject):
     data_changed: SignalInstance = Signal()
     jumps_changed: SignalInstance = Signal()
+    # only which objects are selected changed, not the level itself
+    selection_changed: SignalInstance = Signal()
 
     def __init__(self):
         super(LevelRef, self).__init__()
@@ -42,7 +44,7 @@ class LevelRef(QObject):
         for obj in self._internal_level.get_all_objects():
             obj.selected = obj in selected_objects
 
-        self.data_changed.emit()
+        self.selection_changed.emit()
 
     def __getattr__(self, item: str):
         if self._internal_level is None:
@@ -68,11 +70,11 @@ class LevelRef(QObject):
 
         self.data_changed.emit()
 
-    def import_undo_stack_data(self, undo_index, byte_data):
-        self.level.undo_stack.import_data(undo_index, byte_data)
+    def import_undo_stack_data(self, undo_index, entries):
+        self.level.undo_stack.import_data(undo_index, entries)
 
-        if byte_data:
-            self.set_level_state(*byte_data[undo_index])
+        if entries:
+            self.set_level_state(*self.level.undo_stack.current_state)
 
     def save_level_state(self):
         self.undo_stack.save_level_state(self._internal_level.to_bytes())
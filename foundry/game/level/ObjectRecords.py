@@ -0,0 +1,64 @@
+from array import array
+from typing import Iterator
+
+
+class ObjectRecords:
+    """
+    The level objects of a level, as they were parsed from its data, stored field by field in compact byte arrays,
+    instead of as LevelObjects.
+
+    Creating a LevelObject sets up everything needed to draw and edit it, which is comparatively expensive. A level only
+    turns its records into LevelObjects, once its objects are actually needed. Until then, its size and bytes can be
+    taken from the records.
+    """
+
+    def __init__(self):
+        self.domains = array("B")
+        self.x_positions = array("B")
+        self.y_positions = array("B")
+        self.obj_indexes = array("B")
+
+        # 4 byte objects have a separate length byte, which is 0 for all others
+        self.is_4byte = array("B")
+        self.lengths = array("B")
+
+    def __len__(self):
+        return len(self.obj_indexes)
+
+    def __iter__(self) -> Iterator[bytearray]:
+        for index in range(len(self)):
+            yield self.record(index)
+
+    def append(self, data: bytearray):
+        """
+        :param data: The 3 or 4 bytes of a level object.
+        """
+        self.domains.append((data[0] & 0b1110_0000) >> 5)
+        self.y_positions.append(data[0] & 0b0001_1111)
+        self.x_positions.append(data[1])
+        self.obj_indexes.append(data[2])
+
+        self.is_4byte.append(len(data) == 4)
+        self.lengths.append(data[3] if len(data) == 4 else 0)
+
+    def record(self, index: int) -> bytearray:
+        """
+        Returns the bytes of the level object at the given index.
+        """
+        data = bytearray(3)
+
+        data[0] = (self.domains[index] << 5) | self.y_positions[index]
+        data[1] = self.x_positions[index]
+        data[2] = self.obj_indexes[index]
+
+        if self.is_4byte[index]:
+            data.append(self.lengths[index])
+
+        return data
+
+    @property
+    def byte_length(self) -> int:
+        return 3 * len(self) + sum(self.is_4byte)
+
+    def to_bytes(self) -> bytearray:
+        return bytearray().join(self)
@@ -0,0 +1,118 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PySide2.QtCore import QRect
+
+from foundry.game.gfx.objects.LevelObject import SCREEN_HEIGHT, SCREEN_WIDTH
+from foundry.game.gfx.objects.ObjectLike import ObjectLike
+
+Bucket = Tuple[int, int]
+
+
+class SpatialIndex:
+    """
+    Sorts the objects of a level into buckets, one per screen, that their rects overlap. Looking up the objects at a
+    position or in an area then only needs to check the objects of the screens, that it touches.
+
+    Objects are kept in the order they were added in, which should be the order they have in the level. Objects update
+    their entry themselves, whenever their rect changes. When objects are added, removed or reordered, the index has to
+    be rebuilt.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[Bucket, List[ObjectLike]] = {}
+
+        # object id -> object, rect it was sorted in with, order in the level
+        self._entries: Dict[int, Tuple[ObjectLike, QRect, int]] = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def rebuild(self, objects: Iterable[ObjectLike]):
+        """
+        Replaces the objects in the index.
+
+        :param objects: The objects of the level, back to front.
+        """
+        self.clear()
+
+        for order, obj in enumerate(objects):
+            rect = QRect(obj.get_rect())
+
+            self._entries[id(obj)] = obj, rect, order
+
+            for bucket in self._buckets_of(rect):
+                self._buckets.setdefault(bucket, []).append(obj)
+
+            obj.spatial_index = self
+
+    def clear(self):
+        for obj, _, _ in self._entries.values():
+            obj.spatial_index = None
+
+        self._buckets.clear()
+        self._entries.clear()
+
+    def update(self, obj: ObjectLike):
+        """
+        Moves the object into the buckets of its current rect.
+        """
+        if id(obj) not in self._entries:
+            return
+
+        _, old_rect, order = self._entries[id(obj)]
+        new_rect = QRect(obj.get_rect())
+
+        for bucket in self._buckets_of(old_rect):
+            bucket_objects = self._buckets[bucket]
+
+            # level objects compare equal by their bytes, so look for this exact object
+            for index, other_object in enumerate(bucket_objects):
+                if other_object is obj:
+                    del bucket_objects[index]
+                    break
+
+        self._entries[id(obj)] = obj, new_rect, order
+
+        for bucket in self._buckets_of(new_rect):
+            self._buckets.setdefault(bucket, []).append(obj)
+
+    def object_at(self, x: int, y: int) -> Optional[ObjectLike]:
+        """
+        Returns the foremost object at the given position in the level, or None.
+        """
+        candidates = [obj for obj in self._buckets.get(self._bucket_of(x, y), []) if obj.get_rect().contains(x, y)]
+
+        if not candidates:
+            return None
+
+        return max(candidates, key=self._order_of)
+
+    def objects_intersecting(self, rect: QRect) -> List[ObjectLike]:
+        """
+        Returns the objects overlapping the given rect in the level, back to front.
+        """
+        found_objects: Dict[int, ObjectLike] = {}
+
+        for bucket in self._buckets_of(rect):
+            for obj in self._buckets.get(bucket, []):
+                if id(obj) not in found_objects and rect.intersects(obj.get_rect()):
+                    found_objects[id(obj)] = obj
+
+        return sorted(found_objects.values(), key=self._order_of)
+
+    def _order_of(self, obj: ObjectLike) -> int:
+        return self._entries[id(obj)][2]
+
+    @staticmethod
+    def _bucket_of(x: int, y: int) -> Bucket:
+        return x // SCREEN_WIDTH, y // SCREEN_HEIGHT
+
+    @staticmethod
+    def _buckets_of(rect: QRect) -> List[Bucket]:
+        if rect.isEmpty():
+            return []
+
+        left, top = SpatialIndex._bucket_of(rect.left(), rect.top())
+        right, bottom = SpatialIndex._bucket_of(rect.right(), rect.bottom())
+
+        return [(x, y) for y in range(top, bottom + 1) for x in range(left, right + 1)]
@@ -1,11 +1,14 @@
-from PySide2.QtCore import QPoint, QSize
+from PySide2.QtCore import QRect, QSize
 
 from foundry.game.File import ROM
+from foundry.game.RomCache import tsa_data_of
 from foundry.game.gfx.Palette import load_palette_group
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
 from foundry.game.gfx.objects.MapObject import MapObject
 from foundry.game.level.LevelLike import LevelLike
+from foundry.game.level.SpatialIndex import SpatialIndex
 from smb3parse.levels.world_map import (
     WORLD_MAP_HEIGHT,
     WORLD_MAP_SCREEN_SIZE,
@@ -25,16 +28,19 @@ class WorldMap(LevelLike):
 
         self.name = f"World {world_index} - Overworld"
 
-        self.graphics_set = GraphicsSet(OVERWORLD_GRAPHIC_SET)
+        self.graphics_set = GraphicsSet.from_number(OVERWORLD_GRAPHIC_SET)
         self.palette_group = load_palette_group(WORLD_MAP_OBJECT_SET, 0)
 
         self.object_set = WORLD_MAP_OBJECT_SET
-        self.tsa_data = ROM.get_tsa_data(self.object_set)
+        self.tsa_data = tsa_data_of(self.object_set)
+
+        self.block_atlas = BlockAtlas.get(self.object_set, self.palette_group, self.graphics_set)
 
         self.world = 0
         self.level_number = world_index
 
         self.objects = []
+        self.spatial_index = SpatialIndex()
 
         self._load_objects()
 
@@ -49,12 +55,12 @@ class WorldMap(LevelLike):
             x = screen_offset + (index % WORLD_MAP_SCREEN_WIDTH)
             y = (index // WORLD_MAP_SCREEN_WIDTH) % WORLD_MAP_HEIGHT
 
-            block = Block(world_position.tile(), self.palette_group, self.graphics_set, self.tsa_data)
-
-            self.objects.append(MapObject(block, x, y))
+            self.objects.append(MapObject(self.block_atlas, world_position.tile(), x, y))
 
         assert len(self.objects) % WORLD_MAP_HEIGHT == 0
 
+        self.spatial_index.rebuild(self.objects)
+
     def _calc_size(self):
         self.width = len(self.objects) // WORLD_MAP_HEIGHT
         self.height = WORLD_MAP_HEIGHT
@@ -66,6 +72,8 @@ class WorldMap(LevelLike):
 
         self.objects.sort(key=self._array_index)
 
+        self.spatial_index.rebuild(self.objects)
+
     @property
     def q_size(self):
         return QSize(*self.size) * Block.SIDE_LENGTH
@@ -88,13 +96,10 @@ class WorldMap(LevelLike):
         return self.objects
 
     def object_at(self, x, y):
-        point = QPoint(x, y)
-
-        for obj in reversed(self.objects):
-            if obj.rect.contains(point):
-                return obj
+        return self.spatial_index.object_at(x, y)
 
-        return None
+    def objects_intersecting(self, rect: QRect):
+        return self.spatial_index.objects_intersecting(rect)
 
     def to_bytes(self):
         return_array = bytearray(len(self.objects))
@@ -120,6 +125,8 @@ class WorldMap(LevelLike):
     def remove_object(self, obj):
         self.objects.remove(obj)
 
+        self.spatial_index.rebuild(self.objects)
+
     def level_at_position(self, x: int, y: int):
         screen = x // WORLD_MAP_SCREEN_WIDTH + 1
 
@@ -94,3 +94,71 @@ def test_level_insert_in_vertical_level(level):
     assert added_object.obj_index == object_index
     assert added_object.rendered_base_x == x
     assert added_object.rendered_base_y == y
+
+
+def test_palette_change_keeps_objects(level):
+    # GIVEN a level and its objects
+    objects_before = list(level.objects)
+
+    # WHEN the object palette is changed
+    level.object_palette_index = (level.object_palette_index + 1) % 8
+
+    # THEN the objects are not recreated, but use the new palette group
+    assert level.objects == objects_before
+    assert all(a is b for a, b in zip(level.objects, objects_before))
+
+    assert all(obj.palette_group is level.object_factory.palette_group for obj in level.objects)
+
+
+def test_reload_from_bytes(level):
+    # GIVEN the bytes of a level
+    object_data, enemy_data = level.to_bytes()
+
+    # WHEN the level is loaded from them again
+    level.from_bytes(object_data, enemy_data)
+
+    # THEN the same objects, jumps and enemies are parsed from them
+    assert level.to_bytes() == (object_data, enemy_data)
+
+
+def test_objects_are_created_when_needed(level):
+    # GIVEN a level, that was just loaded
+    object_data, enemy_data = level.to_bytes()
+
+    assert not level._objects
+
+    # WHEN its objects are needed
+    level_objects = level.objects
+
+    # THEN they are created and result in the same bytes
+    assert level_objects
+    assert level.to_bytes() == (object_data, enemy_data)
+
+
+def test_to_bytes_after_changes(level):
+    # GIVEN a level, that was already turned into bytes once
+    level.to_bytes()
+
+    # WHEN an object and an enemy are moved
+    level.objects[0].move_by(1, 0)
+    level.enemies[0].move_by(50, 0)
+
+    (_, object_data), (_, enemy_data) = level.to_bytes()
+
+    # THEN the bytes are the same, as when they are put together from scratch
+    expected_object_data = bytearray(level.header_bytes)
+
+    for obj in level.objects + level.jumps:
+        expected_object_data.extend(obj.to_bytes())
+
+    expected_object_data.append(0xFF)
+
+    expected_enemy_data = bytearray()
+
+    for enemy in sorted(level.enemies, key=lambda _enemy: _enemy.x_position):
+        expected_enemy_data.extend(enemy.to_bytes())
+
+    expected_enemy_data.append(0xFF)
+
+    assert object_data == expected_object_data
+    assert enemy_data == expected_enemy_data
@@ -0,0 +1,59 @@
+from itertools import product
+
+from PySide2.QtCore import QRect
+
+
+def _object_at_linear(level, x, y):
+    for obj in reversed(level.get_all_objects()):
+        if (x, y) in obj:
+            return obj
+    else:
+        return None
+
+
+def test_object_at(level):
+    # GIVEN a level
+    # WHEN looking up the objects at every position
+    # THEN the same objects are found, as when checking every object
+    for x, y in product(range(level.width), range(level.height)):
+        assert level.object_at(x, y) is _object_at_linear(level, x, y)
+
+
+def test_moved_object(level):
+    # GIVEN an object in a level
+    level_object = level.objects[0]
+
+    # WHEN it is moved
+    level_object.set_position(100, 5)
+    level_object.render()
+
+    # THEN it is found at its new position
+    found_objects = level.objects_intersecting(QRect(100, 5, 1, 1))
+
+    assert any(obj is level_object for obj in found_objects)
+
+
+def test_objects_intersecting(level):
+    # GIVEN a level
+    rect = QRect(10, 10, 20, 10)
+
+    # WHEN looking up the objects in an area
+    found_objects = level.objects_intersecting(rect)
+
+    # THEN they are the same and in the same order, as when checking every object
+    expected_objects = [obj for obj in level.get_all_objects() if rect.intersects(obj.get_rect())]
+
+    assert len(found_objects) == len(expected_objects)
+    assert all(found is expected for found, expected in zip(found_objects, expected_objects))
+
+
+def test_removed_object(level):
+    # GIVEN an object in a level
+    enemy = level.enemies[0]
+    x, y = enemy.get_rect().topLeft().toTuple()
+
+    # WHEN it is removed
+    level.remove_object(enemy)
+
+    # THEN it is not found anymore
+    assert level.object_at(x, y) is not enemy
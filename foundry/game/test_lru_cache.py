@@ -0,0 +1,61 @@
+from foundry.game.LRUCache import LRUCache
+
+
+def _cache(max_bytes: int) -> LRUCache:
+    cache = LRUCache("Test", max_bytes, size_of=len)
+
+    LRUCache.instances.remove(cache)
+
+    return cache
+
+
+def test_least_recently_used_is_evicted():
+    # GIVEN a cache with room for 2 values
+    cache = _cache(max_bytes=8)
+
+    cache["a"] = b"1234"
+    cache["b"] = b"1234"
+
+    # WHEN the first value is used and a third one added
+    cache.get("a")
+    cache["c"] = b"1234"
+
+    # THEN the value, that was not used for the longest time, is evicted
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+
+    assert cache.size_in_bytes == 8
+    assert cache.evictions == 1
+
+
+def test_stats():
+    # GIVEN a cache with a value
+    cache = _cache(max_bytes=8)
+
+    cache["a"] = b"1234"
+
+    # WHEN looking up an existing and a missing value
+    cache.get("a")
+    cache.get("b")
+
+    # THEN the hit and the miss are counted
+    stats = cache.stats()
+
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 1, 0)
+    assert (stats.entries, stats.size_in_bytes, stats.max_bytes) == (1, 4, 8)
+
+
+def test_shrinking_evicts():
+    # GIVEN a full cache
+    cache = _cache(max_bytes=8)
+
+    cache["a"] = b"1234"
+    cache["b"] = b"1234"
+
+    # WHEN its limit is lowered
+    cache.set_max_bytes(4)
+
+    # THEN values are evicted, until it fits
+    assert len(cache) == 1
+    assert "b" in cache
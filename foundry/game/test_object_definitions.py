@@ -0,0 +1,23 @@
+import pytest
+
+from foundry.game.ObjectDefinitions import OverlayItem, OverlayType, overlay_of
+
+
+@pytest.mark.parametrize(
+    "description, overlay",
+    [
+        ("Bricks", (OverlayType.NONE, OverlayItem.NONE)),
+        ("Downward Pipe (CAN go down)", (OverlayType.PIPE_DOWN, OverlayItem.NONE)),
+        ("Downward Pipe (CAN'T go down)", (OverlayType.NONE, OverlayItem.NONE)),
+        ("Rightward Pipe (CAN go in)", (OverlayType.PIPE_RIGHT, OverlayItem.NONE)),
+        ("Door (CAN go in)", (OverlayType.DOOR, OverlayItem.NONE)),
+        ("Invisible Door", (OverlayType.INVISIBLE_DOOR, OverlayItem.NONE)),
+        ("Red Invisible Note Block", (OverlayType.NOTE_BLOCK_JUMP, OverlayItem.NONE)),
+        ("Brick with Continuous Star", (OverlayType.ITEM_BLOCK, OverlayItem.CONTINUOUS_STAR)),
+        ("Brick with Multi-Coin", (OverlayType.ITEM_BLOCK, OverlayItem.MULTI_COIN)),
+        ("Invisible 1-up", (OverlayType.INVISIBLE_ITEM, OverlayItem.ONE_UP)),
+        ("Silver Coins (appear when you hit a P-Switch)", (OverlayType.SILVER_COINS, OverlayItem.NONE)),
+    ],
+)
+def test_overlay_of(description, overlay):
+    assert overlay_of(description) == overlay
@@ -0,0 +1,27 @@
+from foundry.game.File import ROM
+from foundry.game.RomCache import tsa_data_of
+from foundry.game.gfx.Palette import PALETTE_BASE_ADDRESS, load_palette_group
+from smb3parse.objects.object_set import PLAINS_OBJECT_SET
+
+
+def test_derived_data_is_cached():
+    # GIVEN data derived from the ROM
+    tsa_data = tsa_data_of(PLAINS_OBJECT_SET)
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+
+    # WHEN asking for it again
+    # THEN the same objects are returned, without reading the ROM again
+    assert tsa_data_of(PLAINS_OBJECT_SET) is tsa_data
+    assert load_palette_group(PLAINS_OBJECT_SET, 0) is palette_group
+
+
+def test_cache_is_invalidated_on_write():
+    # GIVEN a palette group read from the ROM
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+
+    # WHEN the ROM was written to (with the same value, to not change it for other tests)
+    ROM().bulk_write(ROM().bulk_read(1, PALETTE_BASE_ADDRESS), PALETTE_BASE_ADDRESS)
+
+    # THEN it is read in again, with the same result
+    assert load_palette_group(PLAINS_OBJECT_SET, 0) is not palette_group
+    assert load_palette_group(PLAINS_OBJECT_SET, 0) == palette_group
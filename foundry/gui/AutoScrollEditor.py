@@ -57,7 +57,7 @@ class AutoScrollEditor(CustomDialog):
     def _update_y_position(self, _):
         autoscroll_item = _get_autoscroll(self.level_ref.enemies)
 
-        autoscroll_item.y_position = self.y_position_spinner.value()
+        autoscroll_item.set_position(autoscroll_item.x_position, self.y_position_spinner.value())
 
         self.level_ref.data_changed.emit()
 
@@ -67,7 +67,7 @@ class AutoScrollEditor(CustomDialog):
         autoscroll_item = _get_autoscroll(self.level_ref.enemies)
 
         if autoscroll_item is not None:
-            self.level_ref.enemies.remove(autoscroll_item)
+            self.level_ref.level.remove_object(autoscroll_item)
 
         if should_insert:
             self.level_ref.enemies.insert(0, self._create_autoscroll_object())
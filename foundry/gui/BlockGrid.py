@@ -0,0 +1,170 @@
+from typing import List, Optional, Tuple
+
+from PySide2.QtCore import QPoint, QRect
+from PySide2.QtGui import QImage, QPainter, QPixmap
+
+from foundry.game.LRUCache import LRUCache, pixmap_size
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
+from foundry.game.gfx.drawable.Block import resolve_block_index
+from foundry.game.gfx.objects.LevelObject import BLANK, LevelObject
+
+# block index, selected, transparent
+BlockLayer = Tuple[int, bool, bool]
+
+# cells, block index, selected
+BlockFill = Tuple[QRect, int, bool]
+
+_block_pixmap_cache = LRUCache("Fill blocks", max_bytes=2 * 1024 * 1024, size_of=pixmap_size)
+
+
+def _block_pixmap(atlas_image: QImage, block_index: int, block_length: int) -> QPixmap:
+    key = (atlas_image.cacheKey(), block_index)
+
+    block_pixmap = _block_pixmap_cache.get(key)
+
+    if block_pixmap is None:
+        block_pixmap = QPixmap.fromImage(atlas_image.copy(BlockAtlas.block_rect(block_index, block_length)))
+
+        _block_pixmap_cache[key] = block_pixmap
+
+    return block_pixmap
+
+
+class BlockGrid:
+    """
+    The blocks of level objects, placed into a grid covering a part of the level, in the order the objects are drawn
+    in. Positions are given in level coordinates, blocks outside the grid are ignored.
+
+    Every cell holds a stack of the blocks placed into it, bottom to top. Placing a block, that covers the whole cell,
+    discards the blocks below it, since they would not be visible anyway. Drawing the grid then only draws the blocks,
+    that can actually be seen, row by row.
+
+    Areas filled with a single block, like the backgrounds spanning the whole level, are not put into the cells, but
+    kept as a whole and drawn below them with one tiled blit each.
+    """
+
+    def __init__(self, width: int, height: int, block_atlas: BlockAtlas, x: int = 0, y: int = 0):
+        """
+        :param width: The number of columns of the grid.
+        :param height: The number of rows of the grid.
+        :param block_atlas: The atlas to draw the blocks from.
+        :param x: The level column of the leftmost cells.
+        :param y: The level row of the topmost cells.
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+
+        self.block_atlas = block_atlas
+
+        self.cells: List[Optional[List[BlockLayer]]] = [None] * (width * height)
+        self.fills: List[BlockFill] = []
+
+    def place_block(self, x: int, y: int, block_index: int, selected=False, transparent=False):
+        x -= self.x
+        y -= self.y
+
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return
+
+        block_index = resolve_block_index(block_index)
+
+        layer = (block_index, selected, transparent)
+        cell_index = y * self.width + x
+
+        if not transparent or self.block_atlas.is_opaque(block_index) or self.cells[cell_index] is None:
+            self.cells[cell_index] = [layer]
+        else:
+            self.cells[cell_index].append(layer)
+
+    def place_object(self, level_object: LevelObject, transparent: bool):
+        for index, block_index in enumerate(level_object.rendered_blocks):
+            if block_index == BLANK:
+                continue
+
+            x = level_object.rendered_base_x + index % level_object.rendered_width
+            y = level_object.rendered_base_y + index // level_object.rendered_width
+
+            self.place_block(x, y, block_index, level_object.selected, transparent)
+
+    def fill(self, x: int, y: int, width: int, height: int, block_index: int, selected=False):
+        """
+        Places the same opaque block into every cell of the given area.
+        """
+        area = QRect(x, y, width, height).intersected(self.rect)
+
+        if area.isEmpty():
+            return
+
+        left = area.left() - self.x
+
+        # the fill hides everything placed into these cells so far
+        for block_y in range(area.top() - self.y, area.bottom() - self.y + 1):
+            row_start = block_y * self.width
+
+            self.cells[row_start + left : row_start + left + area.width()] = [None] * area.width()
+
+        self.fills.append((area, resolve_block_index(block_index), selected))
+
+    @property
+    def rect(self) -> QRect:
+        """
+        The cells of the grid in level coordinates.
+        """
+        return QRect(self.x, self.y, self.width, self.height)
+
+    def draw(self, painter: QPainter, block_length: int, area: Optional[QRect] = None):
+        """
+        Draws the visible blocks of the grid.
+
+        :param painter: The painter to draw with.
+        :param block_length: The side length of a block in pixels.
+        :param area: The cells in level coordinates, that should be drawn. All of them by default.
+        """
+        if area is None:
+            area = self.rect
+
+        area = area.intersected(self.rect)
+
+        if area.isEmpty():
+            return
+
+        first_column, last_column = area.left() - self.x, area.right() - self.x + 1
+
+        atlas_images = {}
+
+        for fill_area, block_index, selected in self.fills:
+            fill_area = fill_area.intersected(area)
+
+            if fill_area.isEmpty():
+                continue
+
+            variant = (selected, False)
+
+            if variant not in atlas_images:
+                atlas_images[variant] = self.block_atlas.image(selected, False, block_length)
+
+            painter.drawTiledPixmap(
+                QRect(fill_area.topLeft() * block_length, fill_area.size() * block_length),
+                _block_pixmap(atlas_images[variant], block_index, block_length),
+            )
+
+        for y in range(area.top() - self.y, area.bottom() - self.y + 1):
+            row_start = y * self.width
+
+            for x, cell in enumerate(self.cells[row_start + first_column : row_start + last_column], first_column):
+                if cell is None:
+                    continue
+
+                position = QPoint((self.x + x) * block_length, (self.y + y) * block_length)
+
+                for block_index, selected, transparent in cell:
+                    variant = (selected, transparent)
+
+                    if variant not in atlas_images:
+                        atlas_images[variant] = self.block_atlas.image(selected, transparent, block_length)
+
+                    painter.drawImage(
+                        position, atlas_images[variant], self.block_atlas.block_rect(block_index, block_length)
+                    )
@@ -5,10 +5,10 @@ from PySide2.QtGui import QBrush, QMouseEvent, QPaintEvent, QPainter, QResizeEve
 from PySide2.QtWidgets import QComboBox, QLabel, QLayout, QStatusBar, QToolBar, QWidget
 
 from foundry import icon
-from foundry.game.File import ROM
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import PALETTE_GROUPS_PER_OBJECT_SET, bg_color_for_object_set, load_palette_group
 from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.BlockAtlas import BLOCKS_PER_ROW, BlockAtlas
 from foundry.gui.CustomChildWindow import CustomChildWindow
 from foundry.gui.LevelSelector import OBJECT_SET_ITEMS
 from foundry.gui.Spinner import Spinner
@@ -158,20 +158,16 @@ class BlockBank(QWidget):
 
         painter.drawRect(QRect(QPoint(0, 0), self.size()))
 
-        graphics_set = GraphicsSet(self.object_set)
+        graphics_set = GraphicsSet.from_number(self.object_set)
         palette = load_palette_group(self.object_set, self.palette_group)
-        tsa_data = ROM.get_tsa_data(self.object_set)
 
-        horizontal = self.sprites_horiz
+        block_atlas = BlockAtlas.get(self.object_set, palette, graphics_set)
 
         block_length = Block.WIDTH * self.zoom
 
-        for i in range(self.sprites):
-            block = Block(i, palette, graphics_set, tsa_data)
+        # the atlas has the same layout as the bank, so it can be drawn in one go
+        assert self.sprites_horiz == BLOCKS_PER_ROW
 
-            x = (i % horizontal) * block_length
-            y = (i // horizontal) * block_length
-
-            block.draw(painter, x, y, block_length)
+        painter.drawImage(QPoint(0, 0), block_atlas.image(block_length=block_length))
 
         return
@@ -1,26 +1,40 @@
-from itertools import product
-from typing import Tuple
+from enum import Enum
+from typing import Iterable, List, Optional, Tuple, Union
 
 from PySide2.QtCore import QPoint, QRect
-from PySide2.QtGui import QBrush, QColor, QImage, QPainter, QPen, Qt
+from PySide2.QtGui import QBrush, QColor, QImage, QPainter, QPen, QPixmap, Qt
 
 from foundry import data_dir
 from foundry.game.File import ROM
+from foundry.game.ObjectDefinitions import OverlayItem, OverlayType
+from foundry.game.LRUCache import LRUCache, pixmap_size
 from foundry.game.gfx.GraphicsSet import GraphicsSet
 from foundry.game.gfx.Palette import NESPalette, bg_color_for_object_set, load_palette_group
 from foundry.game.gfx.drawable import apply_selection_overlay
 from foundry.game.gfx.drawable.Block import Block
-from foundry.game.gfx.objects.EnemyItem import EnemyObject, MASK_COLOR
-from foundry.game.gfx.objects.LevelObject import GROUND, SCREEN_HEIGHT, SCREEN_WIDTH
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
+from foundry.game.gfx.drawable.EnemySprites import MASK_COLOR, gfx_png
+from foundry.game.gfx.objects.EnemyItem import EnemyObject
+from foundry.game.gfx.objects.LevelObject import GROUND, SCREEN_HEIGHT, SCREEN_WIDTH, LevelObject
 from foundry.game.gfx.objects.ObjectLike import EXPANDS_BOTH, EXPANDS_HORIZ, EXPANDS_VERT
 from foundry.game.level.Level import Level
 from foundry.gui.AutoScrollDrawer import AutoScrollDrawer
+from foundry.gui.BlockGrid import BlockGrid
 from smb3parse.constants import OBJ_AUTOSCROLL
 from smb3parse.levels import LEVEL_MAX_LENGTH
 from smb3parse.objects.object_set import CLOUDY_OBJECT_SET, DESERT_OBJECT_SET, DUNGEON_OBJECT_SET, ICE_OBJECT_SET
 
-png = QImage(str(data_dir / "gfx.png"))
-png.convertTo(QImage.Format_RGB888)
+png = gfx_png()
+
+_overlay_cache = LRUCache("Overlays", max_bytes=8 * 1024 * 1024)
+
+
+_default_graphics_cache = LRUCache("Default graphics", max_bytes=4 * 1024 * 1024, size_of=pixmap_size)
+
+DEFAULT_GRAPHICS_OBJECT_SETS = [DESERT_OBJECT_SET, DUNGEON_OBJECT_SET, ICE_OBJECT_SET]
+
+# the default graphics repeat after this many columns
+DEFAULT_GRAPHICS_PERIOD = 2
 
 
 def _make_image_selected(image: QImage) -> QImage:
@@ -42,6 +56,32 @@ def _load_from_png(x: int, y: int):
     return image
 
 
+def _scaled_overlay(image: QImage, block_length: int, selected=False) -> QImage:
+    """
+    Returns the overlay image scaled to the block length. Selected overlays are drawn twice, once normally and once with
+    the selection overlay on top, so their images already contain both.
+    """
+    key = (image.cacheKey(), block_length, selected)
+
+    scaled_image = _overlay_cache.get(key)
+
+    if scaled_image is None:
+        scaled_image = image.scaled(block_length, block_length)
+
+        if selected:
+            selected_image = _make_image_selected(scaled_image)
+
+            scaled_image = QImage(scaled_image)
+
+            painter = QPainter(scaled_image)
+            painter.drawImage(0, 0, selected_image)
+            painter.end()
+
+        _overlay_cache[key] = scaled_image
+
+    return scaled_image
+
+
 FIRE_FLOWER = _load_from_png(16, 53)
 LEAF = _load_from_png(17, 53)
 NORMAL_STAR = _load_from_png(18, 53)
@@ -65,6 +105,22 @@ ITEM_ARROW = _load_from_png(53, 53)
 
 EMPTY_IMAGE = _load_from_png(0, 53)
 
+ITEM_IMAGES = {
+    OverlayItem.FIRE_FLOWER: FIRE_FLOWER,
+    OverlayItem.LEAF: LEAF,
+    OverlayItem.CONTINUOUS_STAR: CONTINUOUS_STAR,
+    OverlayItem.STAR: NORMAL_STAR,
+    OverlayItem.MULTI_COIN: MULTI_COIN,
+    OverlayItem.COIN: COIN,
+    OverlayItem.ONE_UP: ONE_UP,
+    OverlayItem.VINE: VINE,
+    OverlayItem.P_SWITCH: P_SWITCH,
+}
+
+INVISIBLE_ITEM_IMAGES = {OverlayItem.COIN: INVISIBLE_COIN, OverlayItem.ONE_UP: INVISIBLE_1_UP}
+
+PIPE_OVERLAYS = [OverlayType.PIPE_UP, OverlayType.PIPE_DOWN, OverlayType.PIPE_LEFT, OverlayType.PIPE_RIGHT]
+
 
 SPECIAL_BACKGROUND_OBJECTS = [
     "blue background",
@@ -74,20 +130,33 @@ SPECIAL_BACKGROUND_OBJECTS = [
 ]
 
 
-def _block_from_index(block_index: int, level: Level) -> Block:
+def _block_atlas_of(level: Level) -> BlockAtlas:
     """
-    Returns the block at the given index, from the TSA table for the given level.
+    Returns the atlas of all blocks, using the object set, palette group and graphics set of the given level.
 
-    :param block_index:
     :param level:
     :return:
     """
 
     palette_group = load_palette_group(level.object_set_number, level.header.object_palette_index)
-    graphics_set = GraphicsSet(level.header.graphic_set_index)
-    tsa_data = ROM().get_tsa_data(level.object_set_number)
+    graphics_set = GraphicsSet.from_number(level.header.graphic_set_index)
 
-    return Block(block_index, palette_group, graphics_set, tsa_data)
+    return BlockAtlas.get(level.object_set_number, palette_group, graphics_set)
+
+
+class Layer(Enum):
+    """
+    The parts of a level, that the level drawer draws on top of each other, in order. What is drawn into a layer only
+    changes with the level and the options of the drawer, that the layer depends on.
+    """
+
+    # the background color and the default graphics of the object set
+    BACKGROUND = 0
+    # the blocks of the level objects
+    OBJECTS = 1
+    ENEMIES = 2
+    # the arrows of pipes and doors and the items in blocks
+    OVERLAYS = 3
 
 
 class LevelDrawer:
@@ -107,22 +176,61 @@ class LevelDrawer:
         self.grid_pen = QPen(QColor(0x80, 0x80, 0x80, 0x80), width=1)
         self.screen_pen = QPen(QColor(0xFF, 0x00, 0x00, 0xFF), width=1)
 
-    def draw(self, painter: QPainter, level: Level):
-        self._draw_background(painter, level)
+        # the part of the level, that is being drawn, in pixels and in blocks
+        self.clip_rect = QRect()
+        self.visible_blocks = QRect()
+
+    def draw(self, painter: QPainter, level: Level, clip_rect: Optional[QRect] = None):
+        """
+        Draws the level and everything on top of it, that is enabled.
+
+        :param painter: The painter to draw with.
+        :param level: The level to draw.
+        :param clip_rect: The part of the level in pixels, that needs to be drawn, for example the rect of a paint
+        event. Blocks and objects completely outside of it are skipped. Draws the whole level by default.
+        """
+        self.set_clip_rect(level, clip_rect)
+
+        for layer in Layer:
+            self.draw_layer(painter, level, layer)
+
+        self.draw_annotations(painter, level)
+
+    def set_clip_rect(self, level: Level, clip_rect: Optional[QRect] = None):
+        """
+        Sets the part of the level in pixels, that the following calls to draw_layer() and draw_annotations() draw.
+        Sets the whole level by default.
+        """
+        level_rect = level.get_rect(self.block_length)
+
+        if clip_rect is None:
+            clip_rect = level_rect
+
+        self.clip_rect = clip_rect.intersected(level_rect)
+        self.visible_blocks = self._blocks_in(self.clip_rect)
 
-        if level.object_set_number == DESERT_OBJECT_SET:
-            self._draw_desert_default_graphics(painter, level)
-        elif level.object_set_number == DUNGEON_OBJECT_SET:
-            self._draw_dungeon_default_graphics(painter, level)
-        elif level.object_set_number == ICE_OBJECT_SET:
-            self._draw_ice_default_graphics(painter, level)
+    def draw_layer(self, painter: QPainter, level: Level, layer: Layer):
+        if layer == Layer.BACKGROUND:
+            self._draw_background(painter, level)
 
-        # painter.setPen(QPen(QColor(0x00, 0x00, 0x00, 0x80), width=1))
-        # painter.setBrush(Qt.NoBrush)
+            if level.object_set_number in DEFAULT_GRAPHICS_OBJECT_SETS:
+                self._draw_default_graphics(painter, level)
 
-        self._draw_objects(painter, level)
+        elif layer == Layer.OBJECTS:
+            self._draw_objects(painter, level)
 
-        self._draw_overlays(painter, level)
+        elif layer == Layer.ENEMIES:
+            self._draw_enemies(painter, level)
+
+        elif layer == Layer.OVERLAYS:
+            self._draw_overlays(painter, level)
+
+    def draw_annotations(self, painter: QPainter, level: Level):
+        """
+        Draws everything, that is not part of a layer, like the outlines of selected objects and the grid. These are
+        cheap to draw and change often, so they are always drawn directly.
+        """
+        self._draw_selection_outlines(painter, level)
 
         if self.draw_expansions:
             self._draw_expansions(painter, level)
@@ -149,85 +257,207 @@ class LevelDrawer:
         else:
             bg_color = bg_color_for_object_set(level.object_set_number, level.header.object_palette_index)
 
-        painter.fillRect(level.get_rect(self.block_length), bg_color)
+        painter.fillRect(self.clip_rect, bg_color)
 
         painter.restore()
 
-    def _draw_dungeon_default_graphics(self, painter: QPainter, level: Level):
+    def _blocks_in(self, rect: QRect) -> QRect:
+        """
+        Returns the blocks, that the given rect in pixels touches, in level coordinates.
+        """
+        top_left = QPoint(rect.left() // self.block_length, rect.top() // self.block_length)
+        bottom_right = QPoint(rect.right() // self.block_length, rect.bottom() // self.block_length)
+
+        return QRect(top_left, bottom_right)
+
+    def _visible_columns(self) -> range:
+        return range(self.visible_blocks.left(), self.visible_blocks.right() + 1)
+
+    def _visible_rows(self) -> range:
+        return range(self.visible_blocks.top(), self.visible_blocks.bottom() + 1)
+
+    def _is_visible(self, level_rect: QRect) -> bool:
+        return level_rect.intersects(self.visible_blocks)
+
+    def _draw_default_graphics(self, painter: QPainter, level: Level):
+        """
+        Draws the background and floor, that levels of some object sets have by default, by repeating a strip of them
+        over the visible part of the level.
+        """
+        strip = self._default_graphics_strip(level)
+
+        # the strip starts at the first column of the level, so offset it to where the visible part starts
+        strip_offset = QPoint(self.clip_rect.left() % strip.width(), self.clip_rect.top())
+
+        painter.drawTiledPixmap(self.clip_rect, strip, strip_offset)
+
+    def _default_graphics_strip(self, level: Level) -> QPixmap:
+        """
+        Returns the default graphics of the first columns of the level, after which they repeat, over its whole height.
+        """
+        block_atlas = _block_atlas_of(level)
+
+        key = (block_atlas.key, level.height, self.block_length, ROM.generation)
+
+        strip = _default_graphics_cache.get(key)
+
+        if strip is None:
+            strip = QPixmap(DEFAULT_GRAPHICS_PERIOD * self.block_length, level.height * self.block_length)
+            strip.fill(Qt.transparent)
+
+            columns = range(DEFAULT_GRAPHICS_PERIOD)
+            rows = range(level.height)
+
+            strip_painter = QPainter(strip)
+
+            if level.object_set_number == DESERT_OBJECT_SET:
+                self._draw_desert_default_graphics(strip_painter, block_atlas, columns)
+            elif level.object_set_number == DUNGEON_OBJECT_SET:
+                self._draw_dungeon_default_graphics(strip_painter, block_atlas, columns, rows)
+            elif level.object_set_number == ICE_OBJECT_SET:
+                self._draw_ice_default_graphics(strip_painter, block_atlas, columns, rows)
+
+            strip_painter.end()
+
+            _default_graphics_cache[key] = strip
+
+        return strip
+
+    def _draw_dungeon_default_graphics(
+        self, painter: QPainter, block_atlas: BlockAtlas, columns: Iterable[int], rows: Iterable[int]
+    ):
         # draw_background
-        bg_block = _block_from_index(140, level)
+        bg_block = 140
 
-        for x, y in product(range(level.width), range(level.height)):
-            bg_block.draw(painter, x * self.block_length, y * self.block_length, self.block_length)
+        for y in rows:
+            for x in columns:
+                block_atlas.draw_block(
+                    painter, bg_block, x * self.block_length, y * self.block_length, self.block_length
+                )
 
         # draw ceiling
-        ceiling_block = _block_from_index(139, level)
+        ceiling_block = 139
 
-        for x in range(level.width):
-            ceiling_block.draw(painter, x * self.block_length, 0, self.block_length)
+        for x in columns:
+            block_atlas.draw_block(painter, ceiling_block, x * self.block_length, 0, self.block_length)
 
         # draw floor
-        upper_floor_blocks = [_block_from_index(20, level), _block_from_index(21, level)]
-        lower_floor_blocks = [_block_from_index(22, level), _block_from_index(23, level)]
+        upper_floor_blocks = [20, 21]
+        lower_floor_blocks = [22, 23]
 
         upper_y = (GROUND - 2) * self.block_length
         lower_y = (GROUND - 1) * self.block_length
 
-        for block_x in range(level.width):
+        for block_x in columns:
             pixel_x = block_x * self.block_length
 
-            upper_floor_blocks[block_x % 2].draw(painter, pixel_x, upper_y, self.block_length)
-            lower_floor_blocks[block_x % 2].draw(painter, pixel_x, lower_y, self.block_length)
+            block_atlas.draw_block(painter, upper_floor_blocks[block_x % 2], pixel_x, upper_y, self.block_length)
+            block_atlas.draw_block(painter, lower_floor_blocks[block_x % 2], pixel_x, lower_y, self.block_length)
 
-    def _draw_desert_default_graphics(self, painter: QPainter, level: Level):
+    def _draw_desert_default_graphics(self, painter: QPainter, block_atlas: BlockAtlas, columns: Iterable[int]):
         floor_level = (GROUND - 1) * self.block_length
         floor_block_index = 86
 
-        floor_block = _block_from_index(floor_block_index, level)
-
-        for x in range(level.width):
-            floor_block.draw(painter, x * self.block_length, floor_level, self.block_length)
+        for x in columns:
+            block_atlas.draw_block(painter, floor_block_index, x * self.block_length, floor_level, self.block_length)
 
-    def _draw_ice_default_graphics(self, painter: QPainter, level: Level):
-        bg_block = _block_from_index(0x80, level)
+    def _draw_ice_default_graphics(
+        self, painter: QPainter, block_atlas: BlockAtlas, columns: Iterable[int], rows: Iterable[int]
+    ):
+        bg_block = 0x80
 
-        for x, y in product(range(level.width), range(level.height)):
-            bg_block.draw(painter, x * self.block_length, y * self.block_length, self.block_length)
+        for y in rows:
+            for x in columns:
+                block_atlas.draw_block(
+                    painter, bg_block, x * self.block_length, y * self.block_length, self.block_length
+                )
 
     def _draw_objects(self, painter: QPainter, level: Level):
-        for level_object in level.get_all_objects():
+        visible_blocks = self.visible_blocks
+
+        if visible_blocks.isEmpty():
+            return
+
+        block_grid = BlockGrid(
+            visible_blocks.width(),
+            visible_blocks.height(),
+            _block_atlas_of(level),
+            visible_blocks.x(),
+            visible_blocks.y(),
+        )
+
+        # objects, that expand to the ground or the next object, depend on the objects before them, so every object has
+        # to be rendered in order, even if it isn't visible
+        visible_backgrounds = []
+
+        for level_object in level.objects:
             level_object.render()
 
-            if level_object.name.lower() in SPECIAL_BACKGROUND_OBJECTS:
-                width = LEVEL_MAX_LENGTH
-                height = GROUND - level_object.y_position
+            # backgrounds fill more than their rect, so they can't be found by it
+            if self._is_special_background(level_object) and self._is_visible(self._background_rect(level_object)):
+                visible_backgrounds.append(level_object)
 
-                blocks_to_draw = [level_object.blocks[0]] * width * height
+        visible_objects = [
+            level_object
+            for level_object in level.objects_intersecting(visible_blocks)
+            if isinstance(level_object, LevelObject) and not self._is_special_background(level_object)
+        ]
 
-                for index, block_index in enumerate(blocks_to_draw):
-                    x = level_object.x_position + index % width
-                    y = level_object.y_position + index // width
+        for level_object in sorted(visible_backgrounds + visible_objects, key=lambda obj: obj.index_in_level):
+            if self._is_special_background(level_object):
+                background_rect = self._background_rect(level_object)
 
-                    level_object._draw_block(painter, block_index, x, y, self.block_length, False)
+                block_grid.fill(*background_rect.getRect(), level_object.blocks[0], selected=level_object.selected)
             else:
-                level_object.draw(painter, self.block_length, self.transparency)
+                block_grid.place_object(level_object, self.transparency)
 
-            if level_object.selected:
-                painter.save()
+        block_grid.draw(painter, self.block_length, visible_blocks)
+
+    @staticmethod
+    def _is_special_background(level_object: LevelObject) -> bool:
+        return level_object.name.lower() in SPECIAL_BACKGROUND_OBJECTS
 
-                painter.setPen(QPen(QColor(0x00, 0x00, 0x00, 0x80), width=1))
+    @staticmethod
+    def _background_rect(level_object: LevelObject) -> QRect:
+        return QRect(
+            level_object.x_position,
+            level_object.y_position,
+            LEVEL_MAX_LENGTH,
+            GROUND - level_object.y_position,
+        )
+
+    def _objects_near_visible_blocks(self, level: Level) -> List[Union[LevelObject, EnemyObject]]:
+        # overlays and outlines can reach one block past the object they belong to
+        return level.objects_intersecting(self.visible_blocks.adjusted(-1, -1, 1, 1))
+
+    def _draw_enemies(self, painter: QPainter, level: Level):
+        for enemy in level.objects_intersecting(self.visible_blocks):
+            if isinstance(enemy, EnemyObject):
+                enemy.render()
+                enemy.draw(painter, self.block_length, self.transparency)
+
+    def _draw_selection_outlines(self, painter: QPainter, level: Level):
+        painter.save()
+
+        painter.setPen(QPen(QColor(0x00, 0x00, 0x00, 0x80), width=1))
+
+        for level_object in self._objects_near_visible_blocks(level):
+            if level_object.selected:
                 painter.drawRect(level_object.get_rect(self.block_length))
 
-                painter.restore()
+        painter.restore()
 
     def _draw_overlays(self, painter: QPainter, level: Level):
         painter.save()
 
-        for level_object in level.get_all_objects():
-            name = level_object.name.lower()
+        for level_object in self._objects_near_visible_blocks(level):
+            overlay = level_object.overlay
+
+            if overlay == OverlayType.NONE:
+                continue
 
             # only handle this specific enemy item for now
-            if isinstance(level_object, EnemyObject) and "invisible door" not in name:
+            if isinstance(level_object, EnemyObject) and overlay != OverlayType.INVISIBLE_DOOR:
                 continue
 
             pos = level_object.get_rect(self.block_length).topLeft()
@@ -238,7 +468,7 @@ class LevelDrawer:
             fill_object = True
 
             # pipe entries
-            if "pipe" in name and "can go" in name:
+            if overlay in PIPE_OVERLAYS:
                 if not self.draw_jumps_on_objects:
                     continue
 
@@ -249,7 +479,7 @@ class LevelDrawer:
 
                 trigger_position = level_object.get_position()
 
-                if "left" in name:
+                if overlay == OverlayType.PIPE_LEFT:
                     image = LEFT_ARROW
 
                     pos.setX(rect.right())
@@ -259,12 +489,12 @@ class LevelDrawer:
                     x, y = level_object.get_rect().bottomRight().toTuple()
                     trigger_position = (x - 1, y)
 
-                elif "right" in name:
+                elif overlay == OverlayType.PIPE_RIGHT:
                     image = RIGHT_ARROW
                     pos.setX(rect.left() - self.block_length)
                     pos.setY(pos.y() - self.block_length / 2)
 
-                elif "down" in name:
+                elif overlay == OverlayType.PIPE_DOWN:
                     image = DOWN_ARROW
 
                     pos.setX(pos.x() - self.block_length / 2)
@@ -283,10 +513,10 @@ class LevelDrawer:
                 if not self._object_in_jump_area(level, trigger_position):
                     image = NO_JUMP
 
-            elif "door" == name or "door (can go" in name or "invisible door" in name or "red invisible note" in name:
+            elif overlay in [OverlayType.DOOR, OverlayType.INVISIBLE_DOOR, OverlayType.NOTE_BLOCK_JUMP]:
                 fill_object = False
 
-                if "note" in name:
+                if overlay == OverlayType.NOTE_BLOCK_JUMP:
                     image = UP_ARROW
                 else:
                     # door
@@ -301,71 +531,43 @@ class LevelDrawer:
                     image = NO_JUMP
 
             # "?" - blocks, note blocks, wooden blocks and bricks
-            elif "'?' with" in name or "brick with" in name or "bricks with" in name or "block with" in name:
+            elif overlay == OverlayType.ITEM_BLOCK:
                 if not self.draw_items_in_blocks:
                     continue
 
                 pos.setY(pos.y() - self.block_length)
 
-                if "flower" in name:
-                    image = FIRE_FLOWER
-                elif "leaf" in name:
-                    image = LEAF
-                elif "continuous star" in name:
-                    image = CONTINUOUS_STAR
-                elif "star" in name:
-                    image = NORMAL_STAR
-                elif "multi-coin" in name:
-                    image = MULTI_COIN
-                elif "coin" in name:
-                    image = COIN
-                elif "1-up" in name:
-                    image = ONE_UP
-                elif "vine" in name:
-                    image = VINE
-                elif "p-switch" in name:
-                    image = P_SWITCH
-                else:
-                    image = EMPTY_IMAGE
+                image = ITEM_IMAGES.get(level_object.overlay_item, EMPTY_IMAGE)
 
                 # draw little arrow for the offset item overlay
                 arrow_pos = QPoint(pos)
                 arrow_pos.setY(arrow_pos.y() + self.block_length / 4)
-                painter.drawImage(arrow_pos, ITEM_ARROW.scaled(self.block_length, self.block_length))
+                painter.drawImage(arrow_pos, _scaled_overlay(ITEM_ARROW, self.block_length))
 
-            elif "invisible" in name:
+            elif overlay == OverlayType.INVISIBLE_ITEM:
                 if not self.draw_invisible_items:
                     continue
 
-                if "coin" in name:
-                    image = INVISIBLE_COIN
-                elif "1-up" in name:
-                    image = INVISIBLE_1_UP
-                else:
-                    image = EMPTY_IMAGE
+                image = INVISIBLE_ITEM_IMAGES.get(level_object.overlay_item, EMPTY_IMAGE)
 
-            elif "silver coins" in name:
+            else:
+                # silver coins
                 if not self.draw_invisible_items:
                     continue
 
                 image = SILVER_COIN
-            else:
-                continue
 
             if fill_object:
+                scaled_image = _scaled_overlay(image, self.block_length, level_object.selected)
+
                 for x in range(level_object.rendered_width):
                     adapted_pos = QPoint(pos)
                     adapted_pos.setX(pos.x() + x * self.block_length)
 
-                    image = image.scaled(self.block_length, self.block_length)
-                    painter.drawImage(adapted_pos, image)
-
-                    if level_object.selected:
-                        painter.drawImage(adapted_pos, _make_image_selected(image))
+                    painter.drawImage(adapted_pos, scaled_image)
 
             else:
-                image = image.scaled(self.block_length, self.block_length)
-                painter.drawImage(pos, image)
+                painter.drawImage(pos, _scaled_overlay(image, self.block_length))
 
         painter.restore()
 
@@ -380,7 +582,7 @@ class LevelDrawer:
             return False
 
     def _draw_expansions(self, painter: QPainter, level: Level):
-        for level_object in level.get_all_objects():
+        for level_object in self._objects_near_visible_blocks(level):
             if level_object.selected:
                 painter.drawRect(level_object.get_rect(self.block_length))
 
@@ -426,10 +628,10 @@ class LevelDrawer:
 
         painter.setPen(self.grid_pen)
 
-        for x in range(0, panel_width, self.block_length):
-            painter.drawLine(x, 0, x, panel_height)
-        for y in range(0, panel_height, self.block_length):
-            painter.drawLine(0, y, panel_width, y)
+        for x in self._visible_columns():
+            painter.drawLine(x * self.block_length, 0, x * self.block_length, panel_height)
+        for y in self._visible_rows():
+            painter.drawLine(0, y * self.block_length, panel_width, y * self.block_length)
 
         painter.setPen(self.screen_pen)
 
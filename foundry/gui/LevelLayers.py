@@ -0,0 +1,115 @@
+from typing import Iterable, List, Optional, Tuple
+
+from PySide2.QtCore import QPoint, QRect, QSize
+from PySide2.QtGui import QPainter, QPixmap, Qt
+
+from foundry.game.LRUCache import LRUCache, pixmap_size
+from foundry.game.gfx.objects.LevelObject import SCREEN_HEIGHT, SCREEN_WIDTH
+from foundry.game.level.Level import Level
+from foundry.gui.LevelDrawer import Layer, LevelDrawer
+
+# layer, column and row of the tile
+TileKey = Tuple[Layer, int, int]
+
+
+class LevelLayers:
+    """
+    Off-screen images of the layers of a level, as drawn by a level drawer. Painting the level then only blits these
+    images on top of each other and draws the annotations, like the grid, directly.
+
+    Each layer is cut into tiles the size of a screen, which are drawn, when they are first needed, and kept until the
+    part of the level they show, or an option of the drawer their layer depends on, changes. Then only the affected
+    tiles of the affected layers have to be invalidated and drawn again.
+    """
+
+    def __init__(self, level_drawer: LevelDrawer):
+        self.level_drawer = level_drawer
+
+        self._tiles = LRUCache("Level layers", max_bytes=128 * 1024 * 1024, size_of=pixmap_size)
+
+        self._block_length = level_drawer.block_length
+        self._level_size = QSize()
+
+    def invalidate(self, layers: Iterable[Layer] = Layer, rect: Optional[QRect] = None):
+        """
+        Drops the tiles of the given layers, so they are drawn again, the next time they are needed.
+
+        :param layers: The layers to invalidate. All of them by default.
+        :param rect: The part of the level in pixels, that changed. The whole level by default.
+        """
+        if rect is None:
+            rect = QRect(QPoint(0, 0), self._level_size)
+
+        for layer in layers:
+            for column, row in self._tiles_in(rect):
+                if (layer, column, row) in self._tiles:
+                    del self._tiles[(layer, column, row)]
+
+    def draw(self, painter: QPainter, level: Level, clip_rect: QRect):
+        """
+        Draws the part of the level inside the clip rect, taking the layers from the cache, where possible.
+        """
+        level_rect = level.get_rect(self.level_drawer.block_length)
+
+        if self._block_length != self.level_drawer.block_length or self._level_size != level_rect.size():
+            self._tiles.clear()
+
+            self._block_length = self.level_drawer.block_length
+            self._level_size = level_rect.size()
+
+        clip_rect = clip_rect.intersected(level_rect)
+
+        for layer in Layer:
+            for column, row in self._tiles_in(clip_rect):
+                tile_rect = self._tile_rect(column, row)
+                target_rect = tile_rect.intersected(clip_rect)
+
+                painter.drawPixmap(
+                    target_rect,
+                    self._tile(level, layer, column, row),
+                    target_rect.translated(-tile_rect.topLeft()),
+                )
+
+        self.level_drawer.set_clip_rect(level, clip_rect)
+        self.level_drawer.draw_annotations(painter, level)
+
+    def _tile(self, level: Level, layer: Layer, column: int, row: int) -> QPixmap:
+        key = (layer, column, row)
+
+        tile = self._tiles.get(key)
+
+        if tile is None:
+            tile_rect = self._tile_rect(column, row)
+
+            tile = QPixmap(tile_rect.size())
+            tile.fill(Qt.transparent)
+
+            painter = QPainter(tile)
+            painter.translate(-tile_rect.topLeft())
+
+            self.level_drawer.set_clip_rect(level, tile_rect)
+            self.level_drawer.draw_layer(painter, level, layer)
+
+            painter.end()
+
+            self._tiles[key] = tile
+
+        return tile
+
+    def _tile_rect(self, column: int, row: int) -> QRect:
+        tile_width = SCREEN_WIDTH * self._block_length
+        tile_height = SCREEN_HEIGHT * self._block_length
+
+        return QRect(column * tile_width, row * tile_height, tile_width, tile_height)
+
+    def _tiles_in(self, rect: QRect) -> List[Tuple[int, int]]:
+        if rect.isEmpty():
+            return []
+
+        tile_width = SCREEN_WIDTH * self._block_length
+        tile_height = SCREEN_HEIGHT * self._block_length
+
+        columns = range(max(0, rect.left()) // tile_width, max(0, rect.right()) // tile_width + 1)
+        rows = range(max(0, rect.top()) // tile_height, max(0, rect.bottom()) // tile_height + 1)
+
+        return [(column, row) for row in rows for column in columns]
@@ -2,7 +2,7 @@ from bisect import bisect_right
 from typing import List, Optional, Tuple, Union
 from warnings import warn
 
-from PySide2.QtCore import QMimeData, QPoint, QSize
+from PySide2.QtCore import QMimeData, QPoint, QRect, QSize
 from PySide2.QtGui import QDragEnterEvent, QDragMoveEvent, QMouseEvent, QPaintEvent, QPainter, QWheelEvent, Qt
 from PySide2.QtWidgets import QSizePolicy, QToolTip, QWidget
 
@@ -14,9 +14,11 @@ from foundry.game.level.Level import Level
 from foundry.game.level.LevelRef import LevelRef
 from foundry.game.level.WorldMap import WorldMap
 from foundry.gui.ContextMenu import ContextMenu
-from foundry.gui.LevelDrawer import LevelDrawer
+from foundry.gui.LevelDrawer import Layer, LevelDrawer
+from foundry.gui.LevelLayers import LevelLayers
 from foundry.gui.SelectionSquare import SelectionSquare
 from foundry.gui.settings import RESIZE_LEFT_CLICK, RESIZE_RIGHT_CLICK, SETTINGS
+from smb3parse.constants import OBJ_AUTOSCROLL
 
 HIGHEST_ZOOM_LEVEL = 8  # on linux, at least
 LOWEST_ZOOM_LEVEL = 1 / 16  # on linux, but makes sense with 16x16 blocks
@@ -48,11 +50,19 @@ class LevelView(QWidget):
         self.setAcceptDrops(True)
 
         self.level_ref: LevelRef = level
-        self.level_ref.data_changed.connect(self.update)
+        self.level_ref.data_changed.connect(self._on_data_changed)
+        self.level_ref.selection_changed.connect(self._on_selection_changed)
+
+        # set while saving a change, whose area in the view was already repainted
+        self._change_repainted = False
+
+        # the selection, that was last repainted, so its objects can be repainted, when they are deselected
+        self._selected_objects: List[Union[LevelObject, EnemyObject]] = []
 
         self.context_menu = context_menu
 
         self.level_drawer = LevelDrawer()
+        self.level_layers = LevelLayers(self.level_drawer)
 
         self.draw_grid = SETTINGS["draw_grid"]
         self.draw_jumps = SETTINGS["draw_jumps"]
@@ -109,6 +119,9 @@ class LevelView(QWidget):
     def transparency(self, value):
         self.level_drawer.transparency = value
 
+        self.level_layers.invalidate([Layer.OBJECTS, Layer.ENEMIES])
+        self._repaint()
+
     @property
     def draw_grid(self):
         return self.level_drawer.draw_grid
@@ -117,6 +130,8 @@ class LevelView(QWidget):
     def draw_grid(self, value):
         self.level_drawer.draw_grid = value
 
+        self._repaint()
+
     @property
     def draw_jumps(self):
         return self.level_drawer.draw_jumps
@@ -125,6 +140,8 @@ class LevelView(QWidget):
     def draw_jumps(self, value):
         self.level_drawer.draw_jumps = value
 
+        self._repaint()
+
     @property
     def draw_mario(self):
         return self.level_drawer.draw_mario
@@ -133,6 +150,8 @@ class LevelView(QWidget):
     def draw_mario(self, value):
         self.level_drawer.draw_mario = value
 
+        self._repaint()
+
     @property
     def draw_expansions(self):
         return self.level_drawer.draw_expansions
@@ -141,6 +160,8 @@ class LevelView(QWidget):
     def draw_expansions(self, value):
         self.level_drawer.draw_expansions = value
 
+        self._repaint()
+
     @property
     def draw_jumps_on_objects(self):
         return self.level_drawer.draw_jumps_on_objects
@@ -149,6 +170,9 @@ class LevelView(QWidget):
     def draw_jumps_on_objects(self, value):
         self.level_drawer.draw_jumps_on_objects = value
 
+        self.level_layers.invalidate([Layer.OVERLAYS])
+        self._repaint()
+
     @property
     def draw_items_in_blocks(self):
         return self.level_drawer.draw_items_in_blocks
@@ -157,6 +181,9 @@ class LevelView(QWidget):
     def draw_items_in_blocks(self, value):
         self.level_drawer.draw_items_in_blocks = value
 
+        self.level_layers.invalidate([Layer.OVERLAYS])
+        self._repaint()
+
     @property
     def draw_invisible_items(self):
         return self.level_drawer.draw_invisible_items
@@ -165,6 +192,9 @@ class LevelView(QWidget):
     def draw_invisible_items(self, value):
         self.level_drawer.draw_invisible_items = value
 
+        self.level_layers.invalidate([Layer.OVERLAYS])
+        self._repaint()
+
     @property
     def draw_autoscroll(self):
         return self.level_drawer.draw_autoscroll
@@ -173,6 +203,8 @@ class LevelView(QWidget):
     def draw_autoscroll(self, value):
         self.level_drawer.draw_autoscroll = value
 
+        self._repaint()
+
     def mousePressEvent(self, event: QMouseEvent):
         pressed_button = event.button()
 
@@ -313,10 +345,93 @@ class LevelView(QWidget):
 
             return QSize(width * self.block_length, height * self.block_length)
 
-    def update(self):
+    def update(self, *args):
         self.resize(self.sizeHint())
 
-        super(LevelView, self).update()
+        # whatever is repainted through here has changed, so the cached layers of it have to be drawn again
+        self.level_layers.invalidate(rect=QRect(*args) if args else None)
+
+        super(LevelView, self).update(*args)
+
+    def _repaint(self, *args):
+        """
+        Repaints the view, without invalidating the cached layers of the level. For things that are drawn on top of
+        them, like the selection square.
+        """
+        super(LevelView, self).update(*args)
+
+    def _update_level_rect(self, level_rect: QRect):
+        """
+        Repaints the part of the view, that shows the given rect of the level.
+
+        :param level_rect: The rect in level coordinates.
+        """
+        if level_rect.isEmpty():
+            return
+
+        self.update(self._view_rect_of(level_rect))
+
+    def _on_data_changed(self):
+        if self._change_repainted:
+            self._repaint()
+        else:
+            # header, palette or undo changes can affect the whole level
+            self.update()
+
+    def _save_repainted_change(self):
+        """
+        Saves the level state after a change, that was repainted with _update_changed_objects() while it happened, so
+        the cached layers of the rest of the level are kept.
+        """
+        self._change_repainted = True
+
+        try:
+            self.level_ref.save_level_state()
+        finally:
+            self._change_repainted = False
+
+    def _view_rect_of(self, level_rect: QRect) -> QRect:
+        view_rect = QRect(level_rect.topLeft() * self.block_length, level_rect.size() * self.block_length)
+
+        # overlays, like the arrows of pipes and the items in blocks, are drawn one block outside of their object
+        return view_rect.adjusted(-self.block_length, -self.block_length, self.block_length, self.block_length)
+
+    def _update_objects(self, objects: List[Union[LevelObject, EnemyObject]]):
+        level_rect = QRect()
+
+        for obj in objects:
+            level_rect = level_rect.united(obj.get_rect())
+
+        self._update_level_rect(level_rect)
+
+    def _object_rects(self) -> List[QRect]:
+        return [QRect(obj.get_rect()) for obj in self.level_ref.get_all_objects()]
+
+    def _update_changed_objects(self, rects_before: List[QRect]):
+        """
+        Repaints the old and new area of every object, whose area changed since rects_before was taken.
+
+        Objects, that extend to the ground, stop at the objects below them, so changing one object can change the size
+        of others as well.
+
+        :param rects_before: The rects of all objects in the level, as returned by _object_rects().
+        """
+        level_rect = QRect()
+
+        for obj, rect_before in zip(self.level_ref.get_all_objects(), rects_before):
+            obj.render()
+
+            if obj.get_rect() == rect_before:
+                continue
+
+            if isinstance(obj, EnemyObject) and obj.obj_index == OBJ_AUTOSCROLL:
+                # the auto scroll path spans the whole level
+                self.update()
+                return
+
+            level_rect = level_rect.united(rect_before).united(obj.get_rect())
+
+        self._update_level_rect(level_rect)
 
     def _on_right_mouse_button_down(self, event: QMouseEvent):
         if self.mouse_mode == MODE_DRAG:
@@ -368,12 +483,14 @@ class LevelView(QWidget):
 
         selected_objects = self.get_selected_objects()
 
+        rects_before = self._object_rects()
+
         for obj in selected_objects:
             obj.resize_by(dx, dy)
 
             self.level_ref.changed = True
 
-        self.update()
+        self._update_changed_objects(rects_before)
 
     def _on_right_mouse_button_up(self, event):
         if self.resizing_happened:
@@ -401,7 +518,7 @@ class LevelView(QWidget):
 
     def _stop_resize(self, _):
         if self.resizing_happened:
-            self.level_ref.save_level_state()
+            self._save_repainted_change()
 
         self.resizing_happened = False
         self.mouse_mode = MODE_FREE
@@ -450,12 +567,14 @@ class LevelView(QWidget):
 
         selected_objects = self.get_selected_objects()
 
+        rects_before = self._object_rects()
+
         for obj in selected_objects:
             obj.move_by(dx, dy)
 
             self.level_ref.changed = True
 
-        self.update()
+        self._update_changed_objects(rects_before)
 
     def _on_left_mouse_button_up(self, event: QMouseEvent):
         if self.mouse_mode == MODE_DRAG and self.dragging_happened:
@@ -478,7 +597,7 @@ class LevelView(QWidget):
 
     def _stop_drag(self):
         if self.dragging_happened:
-            self.level_ref.save_level_state()
+            self._save_repainted_change()
 
         self.dragging_happened = False
 
@@ -528,21 +647,37 @@ class LevelView(QWidget):
         if not self.selection_square.is_active():
             return
 
+        square_before = self.selection_square.get_rect()
+        drawn_before = self.selection_square.should_draw
+
         self.selection_square.set_current_end(position)
 
         sel_rect = self.selection_square.get_adjusted_rect(self.block_length, self.block_length)
 
-        touched_objects = [obj for obj in self.level_ref.get_all_objects() if sel_rect.intersects(obj.get_rect())]
+        touched_objects = self.level_ref.level.objects_intersecting(sel_rect)
 
         if touched_objects != self.level_ref.selected_objects:
-            self._set_selected_objects(touched_objects)
+            self.level_ref.selected_objects = touched_objects
 
-        self.update()
+        if drawn_before:
+            self._update_selection_square(square_before)
+
+        self._update_selection_square(self.selection_square.get_rect())
 
     def _stop_selection_square(self):
+        if self.selection_square.should_draw:
+            self._update_selection_square(self.selection_square.get_rect())
+
         self.selection_square.stop()
 
-        self.update()
+    def _update_selection_square(self, square: QRect):
+        # only the outline of the square is drawn, so only repaint its edges
+        square = square.normalized()
+
+        self._repaint(square.left(), square.top(), square.width() + 1, 1)
+        self._repaint(square.left(), square.bottom(), square.width() + 1, 2)
+        self._repaint(square.left(), square.top(), 1, square.height() + 1)
+        self._repaint(square.right(), square.top(), 2, square.height() + 1)
 
     def select_all(self):
         self.select_objects(self.level_ref.get_all_objects())
@@ -554,15 +689,15 @@ class LevelView(QWidget):
             self.select_objects([])
 
     def select_objects(self, objects):
-        self._set_selected_objects(objects)
+        self.level_ref.selected_objects = objects
 
-        self.update()
+    def _on_selection_changed(self):
+        # only the previously and newly selected objects need to be repainted, not the whole level
+        selected_objects = self.level_ref.selected_objects
 
-    def _set_selected_objects(self, objects):
-        if self.level_ref.selected_objects == objects:
-            return
+        self._update_objects(self._selected_objects + selected_objects)
 
-        self.level_ref.selected_objects = objects
+        self._selected_objects = selected_objects
 
     def get_selected_objects(self) -> List[Union[LevelObject, EnemyObject]]:
         return self.level_ref.selected_objects
@@ -772,14 +907,19 @@ class LevelView(QWidget):
 
         level_object.set_position(x, y)
 
+        # the dragged object is not part of the level yet and drawn on top of it
+        if self.currently_dragged_object is not None:
+            self._repaint(self._view_rect_of(self.currently_dragged_object.get_rect()))
+
         self.currently_dragged_object = level_object
 
-        self.repaint()
+        self._repaint(self._view_rect_of(level_object.get_rect()))
 
     def dragLeaveEvent(self, event):
-        self.currently_dragged_object = None
+        if self.currently_dragged_object is not None:
+            self._repaint(self._view_rect_of(self.currently_dragged_object.get_rect()))
 
-        self.repaint()
+        self.currently_dragged_object = None
 
     @undoable
     def dropEvent(self, event):
@@ -819,7 +959,7 @@ class LevelView(QWidget):
 
         self.level_drawer.block_length = self.block_length
 
-        self.level_drawer.draw(painter, self.level_ref.level)
+        self.level_layers.draw(painter, self.level_ref.level, event.rect())
 
         self.selection_square.draw(painter)
 
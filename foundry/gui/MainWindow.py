@@ -1,4 +1,3 @@
-import base64
 import json
 import logging
 import os
@@ -67,6 +66,7 @@ from foundry.gui.ObjectViewer import ObjectViewer
 from foundry.gui.PaletteViewer import PaletteViewer
 from foundry.gui.SettingsDialog import POWERUPS, SettingsDialog
 from foundry.gui.SpinnerPanel import SpinnerPanel
+from foundry.gui.UndoStack import entry_from_json, entry_to_json
 from foundry.gui.WarningList import WarningList
 from foundry.gui.settings import SETTINGS, save_settings
 from smb3parse.constants import TILE_LEVEL_1, Title_DebugMenu, Title_PrepForWorldMap
@@ -479,27 +479,18 @@ class MainWindow(QMainWindow):
         ROM().save_to_file(auto_save_rom_path, set_new_path=False)
 
     def _save_auto_data(self):
-        undo_index, data = self.level_ref.level.undo_stack.export_data()
+        undo_index, entries = self.level_ref.level.undo_stack.export_data()
 
         (level_offset, _), (enemy_offset, _) = self.level_ref.level.to_bytes()
 
         object_set_number = self.level_ref.level.object_set_number
 
-        base64_data = []
-
-        for (object_offset, object_data), (enemy_offset_, enemy_data) in data:
-            base64_data.append(
-                (
-                    object_offset,
-                    base64.b64encode(object_data).decode("ascii"),
-                    enemy_offset_,
-                    base64.b64encode(enemy_data).decode("ascii"),
-                )
-            )
+        # keyframes and deltas are saved as they are, instead of every state of the history in full
+        json_entries = [entry_to_json(entry) for entry in entries]
 
         with open(auto_save_level_data_path, "w") as level_data_file:
             level_data_file.write(
-                json.dumps([object_set_number, level_offset, enemy_offset, (undo_index, base64_data)])
+                json.dumps([object_set_number, level_offset, enemy_offset, (undo_index, json_entries)])
             )
 
     def _load_auto_save(self):
@@ -507,7 +498,7 @@ class MainWindow(QMainWindow):
         with open(auto_save_level_data_path, "r") as level_data_file:
             json_data = level_data_file.read()
 
-            object_set_number, level_offset, enemy_offset, (undo_index, base64_data) = json.loads(json_data)
+            object_set_number, level_offset, enemy_offset, (undo_index, json_entries) = json.loads(json_data)
 
         # load level from ROM, or from m3l file
         if level_offset == enemy_offset == 0:
@@ -524,17 +515,10 @@ class MainWindow(QMainWindow):
             self.update_level("recovered level", level_offset, enemy_offset, object_set_number)
 
         # restore undo/redo stack
-        byte_data = []
-        for undo_data in base64_data:
-            level_offset, object_data, enemy_offset, enemy_data = undo_data
-
-            object_data = bytearray(base64.b64decode(object_data))
-            enemy_data = bytearray(base64.b64decode(enemy_data))
+        entries = [entry_from_json(json_entry) for json_entry in json_entries]
 
-            byte_data.append(((level_offset, object_data), (enemy_offset, enemy_data)))
-
-        self.level_ref.changed = bool(base64_data)
-        self.level_ref.import_undo_stack_data(undo_index, byte_data)
+        self.level_ref.changed = bool(json_entries)
+        self.level_ref.import_undo_stack_data(undo_index, entries)
 
     def _go_to_jump_destination(self):
         if not self.safe_to_change():
@@ -932,8 +916,8 @@ class MainWindow(QMainWindow):
         item_id = action.property(ID_PROP)
 
         if item_id in CHECKABLE_MENU_ITEMS:
+            # the level view repaints itself and only drops the cached layers, that the option affects
             self.on_menu_item_checked(action)
-            self.level_view.update()
 
             # if setting a checkbox, keep the menu open
             menu_of_action: QMenu = self.sender()
@@ -963,7 +947,7 @@ class MainWindow(QMainWindow):
             elif item_id == CMAction.BACKGROUND:
                 self.bring_objects_to_background()
 
-        self.level_view.update()
+            self.level_view.update()
 
     def reload_level(self):
         if not self.safe_to_change():
@@ -15,6 +15,7 @@ class ObjectList(QListWidget):
 
         self.level_ref: LevelRef = level_ref
         self.level_ref.data_changed.connect(self.update_content)
+        self.level_ref.selection_changed.connect(self.update_content)
 
         self.context_menu = context_menu
 
@@ -1,6 +1,6 @@
 from typing import Union
 
-from PySide2.QtWidgets import QStatusBar, QMainWindow
+from PySide2.QtWidgets import QLabel, QStatusBar, QMainWindow
 
 from foundry.game.gfx.objects.EnemyItem import EnemyObject
 from foundry.game.gfx.objects.LevelObject import LevelObject
@@ -13,11 +13,17 @@ class ObjectStatusBar(QStatusBar):
 
         self.level_ref = level_ref
         self.level_ref.data_changed.connect(self.update)
+        self.level_ref.selection_changed.connect(self.update)
+
+        self.undo_label = QLabel(parent=self)
+        self.addPermanentWidget(self.undo_label)
 
     def clear(self):
         self.clearMessage()
 
     def update(self):
+        self._update_undo_label()
+
         selected_objects = self.level_ref.selected_objects
 
         if selected_objects:
@@ -32,3 +38,11 @@ class ObjectStatusBar(QStatusBar):
             message_parts.append(f"{key}: {value}")
 
         self.showMessage(" | ".join(message_parts))
+
+    def _update_undo_label(self):
+        undo_stack = self.level_ref.undo_stack
+
+        if undo_stack is None:
+            self.undo_label.clear()
+        else:
+            self.undo_label.setText(f"Undo history: {len(undo_stack)} steps, {undo_stack.size / 1024:.1f} KiB")
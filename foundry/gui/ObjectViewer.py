@@ -5,7 +5,8 @@ from PySide2.QtGui import QPaintEvent, QPainter
 from PySide2.QtWidgets import QComboBox, QHBoxLayout, QLayout, QStatusBar, QToolBar, QVBoxLayout, QWidget
 
 from foundry.game.gfx.GraphicsSet import GRAPHIC_SET_NAMES
-from foundry.game.gfx.drawable.Block import Block, get_block
+from foundry.game.gfx.drawable.Block import Block, resolve_block_index
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
 from foundry.game.gfx.objects.Jump import Jump
 from foundry.game.gfx.objects.LevelObject import LevelObject
 from foundry.game.gfx.objects.LevelObjectFactory import LevelObjectFactory
@@ -212,26 +213,23 @@ class BlockArray(QWidget):
 
         clear_layout(self.layout())
 
+        block_atlas = self.level_object.block_atlas
+
         for block_index in self.level_object.blocks:
-            block = get_block(
-                block_index,
-                self.level_object.palette_group,
-                self.level_object.graphics_set,
-                self.level_object.tsa_data,
-            )
-            self.layout().addWidget(BlockArea(block))
+            self.layout().addWidget(BlockArea(block_atlas, block_index))
 
         self.update()
 
 
 class BlockArea(QWidget):
-    def __init__(self, block: Block):
+    def __init__(self, block_atlas: BlockAtlas, block_index: int):
         super(BlockArea, self).__init__()
 
-        self.block = block
+        self.block_atlas = block_atlas
+        self.block_index = resolve_block_index(block_index)
 
         self.setContentsMargins(0, 0, 0, 0)
-        self.setToolTip(hex(self.block.index))
+        self.setToolTip(hex(self.block_index))
 
     def sizeHint(self):
         return QSize(Block.WIDTH, Block.HEIGHT)
@@ -239,4 +237,4 @@ class BlockArea(QWidget):
     def paintEvent(self, event):
         painter = QPainter(self)
 
-        self.block.draw(painter, 0, 0, Block.WIDTH)
+        self.block_atlas.draw_block(painter, self.block_index, 0, 0, Block.WIDTH)
@@ -8,17 +8,18 @@ from PySide2.QtWidgets import (
     QLineEdit,
     QPushButton,
     QRadioButton,
+    QSpinBox,
     QVBoxLayout,
     QComboBox,
 )
 
-from PySide2.QtGui import QIcon, QImage, QColor, Qt, QPixmap
+from PySide2.QtGui import QIcon, QColor, Qt, QPixmap
 from PySide2.QtCore import QRect
 
 from foundry.game.gfx.drawable.Block import Block
-from foundry.game.gfx.objects.EnemyItem import MASK_COLOR
+from foundry.game.gfx.drawable.EnemySprites import MASK_COLOR, gfx_png
 
-from foundry import icon, data_dir
+from foundry import icon
 from foundry.gui.CustomDialog import CustomDialog
 from foundry.gui.settings import (
     RESIZE_LEFT_CLICK,
@@ -58,8 +59,7 @@ POWERUPS = [
     ("Tanooki Mario with P-Wing", 55, 53, POWERUP_TANOOKI, True),
 ]
 
-png = QImage(str(data_dir / "gfx.png"))
-png.convertTo(QImage.Format_RGB888)
+png = gfx_png()
 
 
 class SettingsDialog(CustomDialog):
@@ -132,6 +132,24 @@ class SettingsDialog(CustomDialog):
 
             self.gui_style_box.layout().addWidget(style_radio_button)
 
+        # -----------------------------------------------
+        # undo history section
+
+        undo_box = QGroupBox("Undo", self)
+        undo_layout = QHBoxLayout(undo_box)
+
+        label = QLabel("Memory for the undo history (MiB):")
+        label.setToolTip("When the undo history of a level grows larger than this, its oldest steps are forgotten.")
+
+        self.undo_memory_spin_box = QSpinBox()
+        self.undo_memory_spin_box.setRange(1, 1024)
+        self.undo_memory_spin_box.setValue(SETTINGS["undo_memory_limit"])
+        self.undo_memory_spin_box.valueChanged.connect(self._update_settings)
+
+        undo_layout.addWidget(label)
+        undo_layout.addStretch(1)
+        undo_layout.addWidget(self.undo_memory_spin_box)
+
         # -----------------------------------------------
         # emulator command
 
@@ -188,6 +206,7 @@ class SettingsDialog(CustomDialog):
         layout = QVBoxLayout(self)
         layout.addWidget(mouse_box)
         layout.addWidget(self.gui_style_box)
+        layout.addWidget(undo_box)
         layout.addWidget(command_box)
 
         self.update()
@@ -221,6 +240,8 @@ class SettingsDialog(CustomDialog):
 
         SETTINGS["default_powerup"] = self.powerup_combo_box.currentIndex()
 
+        SETTINGS["undo_memory_limit"] = self.undo_memory_spin_box.value()
+
         self.update()
 
     def _get_emulator_path(self):
@@ -26,6 +26,7 @@ class SpinnerPanel(QWidget):
 
         self.level_ref = level_ref
         self.level_ref.data_changed.connect(self.update)
+        self.level_ref.selection_changed.connect(self.update)
 
         self.spin_domain = Spinner(self, maximum=MAX_DOMAIN)
         self.spin_domain.setEnabled(False)
@@ -1,27 +1,233 @@
-from typing import List, Optional, Tuple
+import base64
+import sys
+from typing import List, NamedTuple, Optional, Tuple, Union
 
 from PySide2.QtWidgets import QWidget
 
 from foundry.game.level import LevelByteData
+from foundry.gui.settings import SETTINGS
+
+# every this many steps a full copy of the level is stored, so no state needs more deltas than that to be restored
+KEYFRAME_INTERVAL = 32
+
+
+class Delta(NamedTuple):
+    """
+    The difference between two byte arrays: the new one is the old one with everything between the unchanged prefix
+    and suffix replaced.
+    """
+
+    prefix_length: int
+    suffix_length: int
+    replacement: bytes
+
+    @staticmethod
+    def between(old_data: bytearray, new_data: bytearray) -> "Delta":
+        max_length = min(len(old_data), len(new_data))
+
+        prefix_length = 0
+
+        while prefix_length < max_length and old_data[prefix_length] == new_data[prefix_length]:
+            prefix_length += 1
+
+        suffix_length = 0
+
+        while (
+            suffix_length < max_length - prefix_length and old_data[-1 - suffix_length] == new_data[-1 - suffix_length]
+        ):
+            suffix_length += 1
+
+        return Delta(prefix_length, suffix_length, bytes(new_data[prefix_length : len(new_data) - suffix_length]))
+
+    def apply(self, old_data: bytearray) -> bytearray:
+        return (
+            old_data[: self.prefix_length]
+            + self.replacement
+            + old_data[len(old_data) - self.suffix_length : len(old_data)]
+        )
+
+
+class StateDelta(NamedTuple):
+    """
+    How to get from one level state to the next one.
+    """
+
+    object_offset: int
+    object_delta: Delta
+    enemy_offset: int
+    enemy_delta: Delta
+
+    @staticmethod
+    def between(old_state: LevelByteData, new_state: LevelByteData) -> "StateDelta":
+        (_, old_object_data), (_, old_enemy_data) = old_state
+        (object_offset, new_object_data), (enemy_offset, new_enemy_data) = new_state
+
+        return StateDelta(
+            object_offset,
+            Delta.between(old_object_data, new_object_data),
+            enemy_offset,
+            Delta.between(old_enemy_data, new_enemy_data),
+        )
+
+    def apply(self, old_state: LevelByteData) -> LevelByteData:
+        (_, old_object_data), (_, old_enemy_data) = old_state
+
+        return (
+            (self.object_offset, self.object_delta.apply(old_object_data)),
+            (self.enemy_offset, self.enemy_delta.apply(old_enemy_data)),
+        )
+
+
+UndoEntry = Union[LevelByteData, StateDelta]
+
+
+def _size_of(entry: UndoEntry) -> int:
+    """
+    The number of bytes an entry takes up in memory, including the tuples and byte objects around the level data.
+    For small deltas those are most of it.
+    """
+    if isinstance(entry, StateDelta):
+        return (
+            sys.getsizeof(entry)
+            + sys.getsizeof(entry.object_delta)
+            + sys.getsizeof(entry.object_delta.replacement)
+            + sys.getsizeof(entry.enemy_delta)
+            + sys.getsizeof(entry.enemy_delta.replacement)
+        )
+
+    object_part, enemy_part = entry
+
+    return (
+        sys.getsizeof(entry)
+        + sys.getsizeof(object_part)
+        + sys.getsizeof(object_part[1])
+        + sys.getsizeof(enemy_part)
+        + sys.getsizeof(enemy_part[1])
+    )
+
+
+def _encode(data: bytes) -> str:
+    return base64.b64encode(data).decode("ascii")
+
+
+def _decode(text: str) -> bytearray:
+    return bytearray(base64.b64decode(text))
+
+
+def entry_to_json(entry: UndoEntry) -> list:
+    """
+    Turns an entry of the undo stack into something, that can be written as JSON, like in the auto save.
+    """
+    if isinstance(entry, StateDelta):
+        return [
+            "delta",
+            [entry.object_offset, *entry.object_delta[:2], _encode(entry.object_delta.replacement)],
+            [entry.enemy_offset, *entry.enemy_delta[:2], _encode(entry.enemy_delta.replacement)],
+        ]
+
+    (object_offset, object_data), (enemy_offset, enemy_data) = entry
+
+    return ["keyframe", object_offset, _encode(object_data), enemy_offset, _encode(enemy_data)]
+
+
+def entry_from_json(json_entry: list) -> UndoEntry:
+    """
+    Reads an entry written by entry_to_json(). Auto saves from before the undo stack used deltas stored every state
+    in full and without the leading marker, so those are read as keyframes.
+    """
+    if json_entry[0] == "delta":
+        _, (object_offset, *object_delta), (enemy_offset, *enemy_delta) = json_entry
+
+        return StateDelta(object_offset, _delta_from_json(*object_delta), enemy_offset, _delta_from_json(*enemy_delta))
+
+    if json_entry[0] == "keyframe":
+        json_entry = json_entry[1:]
+
+    object_offset, object_data, enemy_offset, enemy_data = json_entry
+
+    return (object_offset, _decode(object_data)), (enemy_offset, _decode(enemy_data))
+
+
+def _delta_from_json(prefix_length: int, suffix_length: int, replacement: str) -> Delta:
+    return Delta(prefix_length, suffix_length, bytes(_decode(replacement)))
 
 
 class UndoStack(QWidget):
-    def __init__(self):
+    """
+    The states of a level, that can be undone and redone to.
+
+    Only every KEYFRAME_INTERVAL-th state is stored in full. All others are stored as the difference to the state
+    before them. When the stored data grows beyond the memory limit, the oldest states are dropped.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        :param max_bytes: How much memory the stack may take up at most. Taken from the settings, if not given.
+        """
         super(UndoStack, self).__init__()
 
-        self.undo_stack: List[LevelByteData] = []
+        self._max_bytes = max_bytes
+
+        self.undo_stack: List[UndoEntry] = []
         self.undo_index = -1
 
+        # the full state at the undo index, so new states can be compared against it without restoring it first
+        self._current_state: Optional[LevelByteData] = None
+
+        # the memory taken up by all keyframes and deltas in the stack
+        self.size = 0
+
+    @property
+    def max_bytes(self) -> int:
+        if self._max_bytes is None:
+            return SETTINGS["undo_memory_limit"] * 1024 * 1024
+        else:
+            return self._max_bytes
+
     def clear(self, new_initial_state: LevelByteData):
         self.undo_stack = [new_initial_state]
         self.undo_index = 0
 
+        self._current_state = new_initial_state
+        self.size = _size_of(new_initial_state)
+
     def save_level_state(self, data: LevelByteData):
         self.undo_index += 1
 
+        for entry in self.undo_stack[self.undo_index :]:
+            self.size -= _size_of(entry)
+
         self.undo_stack = self.undo_stack[: self.undo_index]
 
-        self.undo_stack.append(data)
+        self._push(data)
+
+        self._drop_oldest_states()
+
+    def _push(self, data: LevelByteData):
+        if self._current_state is None or self._deltas_since_keyframe() == KEYFRAME_INTERVAL - 1:
+            entry: UndoEntry = data
+        else:
+            entry = StateDelta.between(self._current_state, data)
+
+        self.undo_stack.append(entry)
+        self.size += _size_of(entry)
+
+        self._current_state = data
+
+    def _deltas_since_keyframe(self) -> int:
+        """
+        The number of deltas at the top of the stack. Counted, instead of derived from the size of the stack, since
+        dropping the oldest states and saving after an undo both change the stack, without regard to the keyframes.
+        """
+        delta_count = 0
+
+        for entry in reversed(self.undo_stack):
+            if not isinstance(entry, StateDelta):
+                break
+
+            delta_count += 1
+
+        return delta_count
 
     def undo(self) -> Optional[LevelByteData]:
         if not self.undo_stack:
@@ -29,9 +235,9 @@ class UndoStack(QWidget):
 
         self.undo_index -= 1
 
-        data = self.undo_stack[self.undo_index]
+        self._current_state = self._state_at(self.undo_index)
 
-        return data
+        return self._current_state
 
     def redo(self) -> Optional[LevelByteData]:
         if self.undo_index + 1 == len(self.undo_stack):
@@ -39,9 +245,9 @@ class UndoStack(QWidget):
 
         self.undo_index += 1
 
-        data = self.undo_stack[self.undo_index]
+        self._current_state = self._state_at(self.undo_index)
 
-        return data
+        return self._current_state
 
     @property
     def undo_available(self):
@@ -51,12 +257,78 @@ class UndoStack(QWidget):
     def redo_available(self):
         return self.undo_index < len(self.undo_stack) - 1
 
-    def import_data(self, stack_index: int, stack_bytes: List[LevelByteData]) -> None:
+    def _state_at(self, index: int) -> LevelByteData:
+        keyframe_index = index
+
+        while isinstance(self.undo_stack[keyframe_index], StateDelta):
+            keyframe_index -= 1
+
+        state = self.undo_stack[keyframe_index]
+
+        for delta in self.undo_stack[keyframe_index + 1 : index + 1]:
+            state = delta.apply(state)
+
+        return state
+
+    def _drop_oldest_states(self):
+        """
+        Drops states from the bottom of the stack, until it fits into the memory limit again. The current state is
+        always kept, so the level can be restored to it.
+        """
+        while self.size > self.max_bytes and self.undo_index > 0:
+            dropped_entry = self.undo_stack.pop(0)
+            self.size -= _size_of(dropped_entry)
+
+            self.undo_index -= 1
+
+            next_entry = self.undo_stack[0]
+
+            if isinstance(next_entry, StateDelta):
+                # the new bottom of the stack can't depend on the dropped state, so it becomes a keyframe
+                keyframe = next_entry.apply(dropped_entry)
+
+                self.undo_stack[0] = keyframe
+                self.size += _size_of(keyframe) - _size_of(next_entry)
+
+    @property
+    def current_state(self) -> Optional[LevelByteData]:
+        return self._current_state
+
+    def import_data(self, stack_index: int, entries: List[UndoEntry]) -> None:
+        """
+        :param stack_index: The undo index to restore.
+        :param entries: Keyframes and deltas, as returned by export_data(). Every state may also be given in full.
+        """
+        self.undo_stack = []
+        self.undo_index = -1
+
+        self._current_state = None
+        self.size = 0
+
+        state: Optional[LevelByteData] = None
+
+        for entry in entries:
+            if isinstance(entry, StateDelta):
+                state = entry.apply(state)
+            else:
+                state = entry
+
+            self._push(state)
+
+        if not self.undo_stack:
+            return
+
         self.undo_index = stack_index
-        self.undo_stack = stack_bytes
+        self._current_state = self._state_at(self.undo_index)
+
+        self._drop_oldest_states()
 
-    def export_data(self) -> Tuple[int, List[LevelByteData]]:
-        return self.undo_index, self.undo_stack
+    def export_data(self) -> Tuple[int, List[UndoEntry]]:
+        """
+        Returns the undo index and the keyframes and deltas as they are stored, so the history can be saved without
+        restoring every state in full.
+        """
+        return self.undo_index, list(self.undo_stack)
 
     def __len__(self):
         return len(self.undo_stack)
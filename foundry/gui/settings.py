@@ -33,6 +33,8 @@ SETTINGS["block_transparency"] = True
 SETTINGS["object_scroll_enabled"] = False
 SETTINGS["object_tooltip_enabled"] = True
 
+SETTINGS["undo_memory_limit"] = 16  # MiB
+
 
 def load_settings():
     if not default_settings_path.exists():
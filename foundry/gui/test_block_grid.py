@@ -0,0 +1,117 @@
+from PySide2.QtCore import QRect
+from PySide2.QtGui import QColor, QImage, QPainter
+
+from foundry.game.gfx.GraphicsSet import GraphicsSet
+from foundry.game.gfx.Palette import load_palette_group
+from foundry.game.gfx.drawable.Block import Block
+from foundry.game.gfx.drawable.BlockAtlas import BlockAtlas
+from foundry.gui.BlockGrid import BlockGrid
+from smb3parse.objects.object_set import PLAINS_GRAPHICS_SET, PLAINS_OBJECT_SET
+
+SKY_BLOCK = 0x80
+OTHER_BLOCK = 0x11
+
+
+def _block_grid(x: int = 0, y: int = 0) -> BlockGrid:
+    palette_group = load_palette_group(PLAINS_OBJECT_SET, 0)
+    block_atlas = BlockAtlas.get(PLAINS_OBJECT_SET, palette_group, GraphicsSet.from_number(PLAINS_GRAPHICS_SET))
+
+    return BlockGrid(2, 2, block_atlas, x, y)
+
+
+def test_opaque_block_hides_blocks_below(qtbot):
+    # GIVEN a block grid
+    block_grid = _block_grid()
+
+    # WHEN two blocks are placed on top of each other without transparency
+    block_grid.place_block(1, 1, SKY_BLOCK)
+    block_grid.place_block(1, 1, OTHER_BLOCK)
+
+    # THEN only the top one is kept
+    assert block_grid.cells[3] == [(OTHER_BLOCK, False, False)]
+
+
+def test_transparent_blocks_stack(qtbot):
+    # GIVEN a block grid
+    block_grid = _block_grid()
+
+    # WHEN a transparent block without any opaque pixels is placed on top of another
+    block_grid.place_block(0, 0, OTHER_BLOCK)
+    block_grid.place_block(0, 0, SKY_BLOCK, transparent=True)
+
+    # THEN both have to be drawn
+    assert block_grid.cells[0] == [(OTHER_BLOCK, False, False), (SKY_BLOCK, False, True)]
+
+
+def test_blocks_outside_are_ignored(qtbot):
+    # GIVEN a block grid
+    block_grid = _block_grid()
+
+    # WHEN blocks are placed outside of it
+    block_grid.place_block(-1, 0, OTHER_BLOCK)
+    block_grid.fill(1, 1, 5, 5, OTHER_BLOCK)
+
+    # THEN only the cells inside the grid are filled
+    assert block_grid.cells == [None, None, None, None]
+    assert block_grid.fills == [(QRect(1, 1, 1, 1), OTHER_BLOCK, False)]
+
+
+def test_fill_hides_blocks_below(qtbot):
+    # GIVEN a block grid with blocks in it
+    block_grid = _block_grid()
+
+    block_grid.place_block(0, 0, SKY_BLOCK)
+    block_grid.place_block(1, 1, SKY_BLOCK)
+
+    # WHEN an area is filled and a block is placed on top of the fill
+    block_grid.fill(0, 0, 2, 1, OTHER_BLOCK)
+    block_grid.place_block(1, 0, SKY_BLOCK, transparent=True)
+
+    # THEN only the blocks outside the area and placed after the fill are kept
+    assert block_grid.cells == [None, [(SKY_BLOCK, False, True)], None, [(SKY_BLOCK, False, False)]]
+
+
+def test_draw_only_area(qtbot):
+    # GIVEN a block grid with a block in every cell
+    block_grid = _block_grid()
+    block_grid.fill(0, 0, 2, 2, OTHER_BLOCK)
+
+    # WHEN only the bottom right cell is drawn
+    image = QImage(2 * Block.WIDTH, 2 * Block.HEIGHT, QImage.Format_ARGB32)
+    image.fill(QColor(0, 0, 0, 0))
+
+    painter = QPainter(image)
+    block_grid.draw(painter, Block.WIDTH, QRect(1, 1, 1, 1))
+    painter.end()
+
+    # THEN the other cells stay empty
+    assert image.pixelColor(0, 0).alpha() == 0
+    assert image.pixelColor(Block.WIDTH, 0).alpha() == 0
+    assert image.pixelColor(0, Block.HEIGHT).alpha() == 0
+    assert image.pixelColor(Block.WIDTH, Block.HEIGHT).alpha() == 0xFF
+
+
+def test_grid_with_origin(qtbot):
+    # GIVEN a block grid covering only a part of the level
+    block_grid = _block_grid(3, 1)
+
+    # WHEN blocks are placed inside and outside of it and it is drawn
+    block_grid.place_block(0, 0, OTHER_BLOCK)
+    block_grid.place_block(4, 2, OTHER_BLOCK)
+    block_grid.fill(0, 0, 4, 2, OTHER_BLOCK)
+
+    image = QImage(5 * Block.WIDTH, 3 * Block.HEIGHT, QImage.Format_ARGB32)
+    image.fill(QColor(0, 0, 0, 0))
+
+    painter = QPainter(image)
+    block_grid.draw(painter, Block.WIDTH)
+    painter.end()
+
+    # THEN only the cells inside the grid are filled, and drawn at their position in the level
+    assert block_grid.cells == [None, None, None, [(OTHER_BLOCK, False, False)]]
+    assert block_grid.fills == [(QRect(3, 1, 1, 1), OTHER_BLOCK, False)]
+
+    assert image.pixelColor(0, 0).alpha() == 0
+    assert image.pixelColor(3 * Block.WIDTH, Block.HEIGHT).alpha() == 0xFF
+    assert image.pixelColor(4 * Block.WIDTH, 2 * Block.HEIGHT).alpha() == 0xFF
+    assert image.pixelColor(4 * Block.WIDTH, Block.HEIGHT).alpha() == 0
@@ -0,0 +1,51 @@
+from PySide2.QtCore import QRect
+from PySide2.QtGui import QImage, QPainter
+
+from foundry.gui.LevelDrawer import Layer, LevelDrawer
+from foundry.gui.LevelLayers import LevelLayers
+
+
+def _draw(draw_function, level) -> QImage:
+    image = QImage(level.get_rect(16).size(), QImage.Format_RGB32)
+
+    painter = QPainter(image)
+    draw_function(painter)
+    painter.end()
+
+    return image
+
+
+def test_same_as_drawing_directly(level):
+    # GIVEN a level drawer and the layers of a level drawn by it
+    level_drawer = LevelDrawer()
+    level_layers = LevelLayers(level_drawer)
+
+    level_rect = level.get_rect(level_drawer.block_length)
+
+    # WHEN the level is drawn with the layers
+    layered_image = _draw(lambda painter: level_layers.draw(painter, level, level_rect), level)
+
+    # THEN it looks the same as when drawn directly
+    direct_image = _draw(lambda painter: level_drawer.draw(painter, level), level)
+
+    assert layered_image == direct_image
+
+
+def test_invalidated_tiles_are_drawn_again(level):
+    # GIVEN the layers of a level, that were drawn once
+    level_drawer = LevelDrawer()
+    level_layers = LevelLayers(level_drawer)
+
+    level_rect = level.get_rect(level_drawer.block_length)
+
+    _draw(lambda painter: level_layers.draw(painter, level, level_rect), level)
+
+    first_screen = level_layers._tile(level, Layer.OBJECTS, 0, 0)
+    second_screen = level_layers._tile(level, Layer.OBJECTS, 1, 0)
+
+    # WHEN a part of the first screen is invalidated
+    level_layers.invalidate([Layer.OBJECTS], QRect(0, 0, 16, 16))
+
+    # THEN only the tile of the first screen is drawn again
+    assert level_layers._tile(level, Layer.OBJECTS, 0, 0) is not first_screen
+    assert level_layers._tile(level, Layer.OBJECTS, 1, 0) is second_screen
@@ -1,8 +1,10 @@
 import pytest
 from PySide2.QtCore import QPoint
-from PySide2.QtGui import QWheelEvent, Qt
+from PySide2.QtGui import QImage, QPainter, QWheelEvent, Qt
 
+from foundry.game.gfx.objects.LevelObject import SCREEN_WIDTH
 from foundry.gui.HeaderEditor import HeaderEditor
+from foundry.gui.LevelDrawer import Layer
 from foundry.gui.LevelView import LevelView
 from foundry.gui.settings import SETTINGS
 from smb3parse.objects.object_set import ENEMY_ITEM_OBJECT_SET, PLAINS_OBJECT_SET
@@ -111,3 +113,61 @@ def test_wheel_event(scroll_amount, coordinates, wheel_delta, type_change, main_
     new_type = level_view.object_at(*coordinates).type
 
     assert new_type == original_type + type_change, (original_type, new_type)
+
+
+def test_selection_only_repaints_selected_objects(main_window, level_view):
+    # GIVEN a level view, whose layers were drawn once, and an object at the start of the level
+    level = main_window.level_ref.level
+
+    level_rect = level.get_rect(level_view.level_drawer.block_length)
+
+    image = QImage(level_rect.size(), QImage.Format_RGB32)
+    painter = QPainter(image)
+    level_view.level_layers.draw(painter, level, level_rect)
+    painter.end()
+
+    level_object = level.objects[0]
+    last_column = (level.width - 1) // SCREEN_WIDTH
+
+    assert level_object.get_rect().right() + 1 < last_column * SCREEN_WIDTH
+
+    # WHEN the object is selected
+    level_view.select_objects([level_object])
+
+    # THEN the tiles at the end of the level are still cached and the other widgets know about the selection
+    assert (Layer.OBJECTS, last_column, 0) in level_view.level_layers._tiles
+    assert (Layer.BACKGROUND, last_column, 0) in level_view.level_layers._tiles
+
+    assert main_window.spinner_panel.spin_type.value() == level_object.obj_index
+
+
+def test_moving_an_object_keeps_distant_tiles(main_window, level_view):
+    # GIVEN a level view, whose layers were drawn once, and an object at the start of the level
+    level = main_window.level_ref.level
+
+    level_rect = level.get_rect(level_view.level_drawer.block_length)
+
+    image = QImage(level_rect.size(), QImage.Format_RGB32)
+    painter = QPainter(image)
+    level_view.level_layers.draw(painter, level, level_rect)
+    painter.end()
+
+    level_object = level.objects[0]
+    last_column = (level.width - 1) // SCREEN_WIDTH
+
+    assert level_object.get_rect().right() + 2 < last_column * SCREEN_WIDTH
+
+    # WHEN the object is dragged one block to the right
+    rects_before = level_view._object_rects()
+
+    level_object.move_by(1, 0)
+    level_view._update_changed_objects(rects_before)
+
+    level_view.dragging_happened = True
+    level_view._stop_drag()
+
+    # THEN the move can be undone, but the tiles at the end of the level are still cached
+    assert level.undo_stack.undo_available
+
+    assert (Layer.OBJECTS, last_column, 0) in level_view.level_layers._tiles
+    assert (Layer.BACKGROUND, last_column, 0) in level_view.level_layers._tiles
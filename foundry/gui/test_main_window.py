@@ -1,5 +1,8 @@
 from PySide2.QtCore import QPoint
-from PySide2.QtGui import Qt
+from PySide2.QtGui import QImage, QPainter, Qt
+
+from foundry.gui.LevelDrawer import Layer
+from foundry.gui.MainWindow import ID_GRID_LINES, ID_PROP
 
 
 def test_open(main_window):
@@ -27,3 +30,30 @@ def test_middle_click_adds_object(main_window, qtbot):
     assert new_object is not None
     assert new_object.domain == selected_object.domain
     assert new_object.obj_index == selected_object.obj_index
+
+
+def test_toggling_view_option_keeps_cached_layers(main_window, monkeypatch):
+    # GIVEN a level view, whose layers were drawn once
+    level_view = main_window.level_view
+    level = main_window.level_ref.level
+
+    level_rect = level.get_rect(level_view.level_drawer.block_length)
+
+    image = QImage(level_rect.size(), QImage.Format_RGB32)
+    painter = QPainter(image)
+    level_view.level_layers.draw(painter, level, level_rect)
+    painter.end()
+
+    # the view menu is opened again after an option was toggled, which would block the test
+    monkeypatch.setattr(main_window.view_menu, "exec_", lambda *_: None)
+
+    grid_action = next(
+        action for action in main_window.view_menu.actions() if action.property(ID_PROP) == ID_GRID_LINES
+    )
+
+    # WHEN the grid is toggled through the view menu
+    grid_action.trigger()
+
+    # THEN the layers, that don't show the grid, are still cached
+    assert (Layer.BACKGROUND, 0, 0) in level_view.level_layers._tiles
+    assert (Layer.OBJECTS, 0, 0) in level_view.level_layers._tiles
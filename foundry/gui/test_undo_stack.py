@@ -0,0 +1,152 @@
+import base64
+import json
+import sys
+
+from foundry.gui.UndoStack import (
+    KEYFRAME_INTERVAL,
+    StateDelta,
+    UndoStack,
+    _size_of,
+    entry_from_json,
+    entry_to_json,
+)
+
+
+def _state(step: int):
+    object_data = bytearray(range(100))
+    object_data[step % 100] = 0xFF
+
+    enemy_data = bytearray([step % 0x100, 0x20, 0x10, 0xFF])
+
+    return (0x1000, object_data), (0x2000, enemy_data)
+
+
+def test_undo_and_redo_across_keyframes(qtbot):
+    # GIVEN an undo stack with more states, than are between two keyframes
+    undo_stack = UndoStack()
+    undo_stack.clear(_state(0))
+
+    step_count = 2 * KEYFRAME_INTERVAL + 5
+
+    for step in range(1, step_count):
+        undo_stack.save_level_state(_state(step))
+
+    assert any(isinstance(entry, StateDelta) for entry in undo_stack.undo_stack)
+
+    # WHEN undoing and redoing all of them
+    # THEN every state is restored exactly
+    for step in reversed(range(step_count - 1)):
+        assert undo_stack.undo() == _state(step)
+
+    for step in range(1, step_count):
+        assert undo_stack.redo() == _state(step)
+
+
+def test_oldest_states_are_dropped(qtbot):
+    # GIVEN an undo stack, that can hold a little more than 2 full states
+    max_bytes = 2 * _size_of(_state(0)) + 20
+
+    undo_stack = UndoStack(max_bytes)
+    undo_stack.clear(_state(0))
+
+    # WHEN many states are saved
+    for step in range(1, 200):
+        undo_stack.save_level_state(_state(step))
+
+    # THEN the stack stays below its memory limit, but the newest states can still be undone to
+    assert undo_stack.size <= max_bytes
+    assert 1 < len(undo_stack) < 200
+
+    assert undo_stack.undo() == _state(198)
+    assert undo_stack.redo() == _state(199)
+
+
+def test_size_includes_the_bookkeeping_of_deltas(qtbot):
+    # GIVEN an undo stack with an initial state
+    undo_stack = UndoStack()
+    undo_stack.clear(_state(0))
+
+    size_before = undo_stack.size
+
+    # WHEN a state is saved, that differs from it in only a few bytes
+    undo_stack.save_level_state(_state(1))
+
+    # THEN the size grows by more than the changed bytes, since the delta itself takes up memory as well
+    delta = undo_stack.undo_stack[-1]
+
+    assert isinstance(delta, StateDelta)
+    assert undo_stack.size - size_before > sys.getsizeof(delta)
+
+
+def test_keyframe_spacing_survives_dropped_states(qtbot):
+    # GIVEN an undo stack, that has to drop its oldest states regularly
+    undo_stack = UndoStack(3 * _size_of(_state(0)) + 40 * _size_of(StateDelta.between(_state(0), _state(1))))
+    undo_stack.clear(_state(0))
+
+    # WHEN many states are saved
+    for step in range(1, 500):
+        undo_stack.save_level_state(_state(step))
+
+    # THEN no state needs more than KEYFRAME_INTERVAL - 1 deltas to be restored
+    deltas_in_a_row = 0
+
+    for entry in undo_stack.undo_stack:
+        if isinstance(entry, StateDelta):
+            deltas_in_a_row += 1
+        else:
+            deltas_in_a_row = 0
+
+        assert deltas_in_a_row < KEYFRAME_INTERVAL
+
+
+def test_export_and_import_through_json(qtbot):
+    # GIVEN an undo stack with keyframes and deltas, that was partly undone
+    undo_stack = UndoStack()
+    undo_stack.clear(_state(0))
+
+    step_count = KEYFRAME_INTERVAL + 10
+
+    for step in range(1, step_count):
+        undo_stack.save_level_state(_state(step))
+
+    undo_stack.undo()
+
+    # WHEN it is written to JSON, like in the auto save, and read into a new undo stack
+    undo_index, entries = undo_stack.export_data()
+
+    json_entries = json.loads(json.dumps([entry_to_json(entry) for entry in entries]))
+
+    imported_stack = UndoStack()
+    imported_stack.import_data(undo_index, [entry_from_json(json_entry) for json_entry in json_entries])
+
+    # THEN it holds the same history and is at the same state
+    assert imported_stack.current_state == _state(step_count - 2)
+    assert imported_stack.redo() == _state(step_count - 1)
+
+    for step in reversed(range(step_count - 1)):
+        assert imported_stack.undo() == _state(step)
+
+
+def test_import_full_states(qtbot):
+    # GIVEN the history of an auto save from before deltas, which stored every state in full without a marker
+    states = [_state(step) for step in range(5)]
+
+    json_entries = [
+        [
+            object_offset,
+            base64.b64encode(object_data).decode("ascii"),
+            enemy_offset,
+            base64.b64encode(enemy_data).decode("ascii"),
+        ]
+        for (object_offset, object_data), (enemy_offset, enemy_data) in states
+    ]
+
+    # WHEN it is imported
+    undo_stack = UndoStack()
+    undo_stack.import_data(2, [entry_from_json(json_entry) for json_entry in json_entries])
+
+    # THEN the states are restored and stored as deltas again
+    assert undo_stack.current_state == states[2]
+    assert isinstance(undo_stack.undo_stack[1], StateDelta)
+
+    assert undo_stack.redo() == states[3]